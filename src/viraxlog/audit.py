@@ -9,12 +9,15 @@ from __future__ import annotations
 import logging
 import json
 import time
-from typing import Dict, Any, List, Optional
+from itertools import chain
+from typing import Dict, Any, Optional, Iterable, Iterator, Union
 from contextlib import contextmanager
 
 from .database import DatabaseManager
 from .models import ViraxConfig, LogEntry, AuditReport
-from .utils.crypto import verify_log_chain, create_merkle_tree_from_entries
+from .utils.crypto import (
+    verify_log_chain_detailed, MerkleAccumulator, VerificationMemo, compute_chain_tip, verify_chain_tip
+)
 
 logger = logging.getLogger("ViraxLog.Audit")
 
@@ -22,10 +25,21 @@ logger = logging.getLogger("ViraxLog.Audit")
 class ViraxAuditor:
     """Auditeur cryptographique avec optimisations."""
 
-    def __init__(self, config: ViraxConfig):
+    def __init__(self, config: ViraxConfig, memoize: bool = False, incremental: bool = False):
         self.config = config
         self.db = DatabaseManager(config)
         self._last_root_hash = None
+        # Audits répétés: les entrées inchangées ne sont pas re-hashées
+        self._memo: Optional[VerificationMemo] = VerificationMemo() if memoize else None
+        # Audits complets répétés: reprise après le dernier checkpoint (table chain_checkpoints).
+        # Le préfixe scellé n'est pas relu: ses modifications de data passent inaperçues.
+        # Le checkpoint est signé HMAC avec config.encryption_key, sinon falsifiable.
+        self._incremental = incremental
+        if incremental and not config.encryption_key:
+            logger.warning(
+                "Incremental audit without encryption_key: checkpoints are unauthenticated, "
+                "the checkpointed prefix is trusted"
+            )
 
     @contextmanager
     def open(self):
@@ -35,11 +49,10 @@ class ViraxAuditor:
         finally:
             self.close()
 
-    def _rows_to_entries(self, rows: List[dict]) -> List[LogEntry]:
-        """Convertit rows SQLite en LogEntry immutables."""
-        entries = []
+    def _iter_entries(self, rows: Iterable[Any]) -> Iterator[LogEntry]:
+        """Convertit rows SQLite en LogEntry immutables, à la volée."""
         for r in rows:
-            entries.append(LogEntry(
+            yield LogEntry(
                 timestamp=r["timestamp"],
                 session_id=r["session_id"],
                 level=r["level"],
@@ -48,9 +61,8 @@ class ViraxAuditor:
                 data=r["data"],
                 hash=r["hash"],
                 prev_hash=r["prev_hash"],
-                schema_version=r.get("schema_version", 2)
-            ))
-        return entries
+                schema_version=r["schema_version"]
+            )
 
     def validate_full_chain(
         self,
@@ -58,11 +70,14 @@ class ViraxAuditor:
         use_merkle: bool = True
     ) -> AuditReport:
         """
-        Audit complet avec Merkle tree optionnel pour vitesse.
+        Audit complet en streaming: mémoire O(1) quelle que soit la taille du registre.
+        En mode incremental (sans limit), seul le suffixe postérieur au dernier
+        checkpoint valide est vérifié, puis un nouveau checkpoint est scellé:
+        le préfixe est tenu pour intègre. L'audit complet (défaut) relit tout.
         
         Args:
             limit: Max entries à auditer (None = tout)
-            use_merkle: Utiliser Merkle tree pour O(log n) comparé à O(n)
+            use_merkle: Calcule aussi la racine Merkle (incrémentale, O(log n))
         
         Returns:
             AuditReport structuré
@@ -70,9 +85,20 @@ class ViraxAuditor:
         start_time = time.time()
         logger.info("Starting audit...")
 
+        # Préfixe déjà vérifié: (last_id, last_hash, entries), None, ou rapport d'échec du sceau
+        checkpoint = self._load_checkpoint() if self._incremental and not limit else None
+        if isinstance(checkpoint, AuditReport):
+            return checkpoint
+        offset = checkpoint[2] if checkpoint else 0
+
         try:
-            # Récupère rows
-            rows = self.db.get_integrity_rows(limit)
+            # Curseur lazy: les rows sont converties une par une
+            if checkpoint:
+                rows = self.db.get_integrity_rows(after_id=checkpoint[0])
+            else:
+                rows = self.db.get_integrity_rows(limit)
+            entries = self._iter_entries(rows)
+            first = next(entries, None)
         except Exception as e:
             logger.critical(f"Failed to retrieve logs: {e}")
             return AuditReport(
@@ -82,75 +108,137 @@ class ViraxAuditor:
                 error_details={"error": str(e)}
             )
 
-        if not rows:
+        if first is None and checkpoint:
+            logger.info(f"✓ Audit SUCCESS: no new entries since checkpoint ({offset} verified)")
+            return AuditReport(status="success", total_entries=offset, verified_entries=offset)
+
+        if first is None:
             logger.info("Database is empty")
             return AuditReport(status="empty", total_entries=0, verified_entries=0)
 
-        # Convertit rows en entries
-        entries = self._rows_to_entries(rows)
+        # Racine Merkle seulement sur la chaîne entière, pas sur un suffixe
+        merkle = MerkleAccumulator() if use_merkle and not checkpoint else None
+        audited = 0
+        last_hash = first.hash
 
-        # Détermine point de départ
-        starting_hash = entries[0].prev_hash
+        def stream() -> Iterator[LogEntry]:
+            nonlocal audited, last_hash
+            for entry in chain((first,), entries):
+                audited += 1
+                last_hash = entry.hash
+                if merkle is not None:
+                    merkle.add(entry.hash)
+                yield entry
 
-        # Vérification
-        if use_merkle and len(entries) > 1000:
-            # Pour grands datasets, utiliser Merkle tree
-            is_valid, error_index = self._verify_with_merkle_tree(
-                entries, starting_hash
+        # Point de départ: hash du checkpoint, sinon prev_hash de la première entrée auditée
+        # L'entrée en défaut vient du vérificateur: avec audit_workers > 1,
+        # le flux est lu en avance par blocs et le dernier lu n'est pas celui-là
+        try:
+            is_valid, error_index, corrupted_log, expected_prev = verify_log_chain_detailed(
+                stream(),
+                initial_prev_hash=checkpoint[1] if checkpoint else first.prev_hash,
+                algorithm=self.db.hash_algorithm,
+                memo=self._memo,
+                workers=self.config.audit_workers
             )
-        else:
-            # Pour petits datasets, vérification linéaire
-            is_valid, error_index = verify_log_chain(
-                entries, initial_prev_hash=starting_hash
+        except Exception as e:
+            # Lecture interrompue: la chaîne n'a pas été vue en entier, ni succès ni checkpoint
+            logger.critical(f"Audit aborted after {offset + audited} entries: {e}")
+            return AuditReport(
+                status="error",
+                total_entries=self._count_audited(limit),
+                verified_entries=0,
+                error_details={"error": str(e), "entries_read": offset + audited}
             )
 
         elapsed = time.time() - start_time
 
         if is_valid:
-            logger.info(f"✓ Audit SUCCESS: {len(entries)} entries verified")
+            if merkle is not None and audited > 1000:
+                # Garde root hash pour audit futur
+                self._last_root_hash = merkle.root()
+            
+            total = offset + audited
+            if self._incremental and not limit:
+                self._save_checkpoint(last_hash, total)
+            
+            logger.info(f"✓ Audit SUCCESS: {total} entries verified")
             return AuditReport(
                 status="success",
-                total_entries=len(entries),
-                verified_entries=len(entries)
+                total_entries=total,
+                verified_entries=total
             )
         else:
-            corrupted_log = entries[error_index]
+            error_index += offset
             logger.error(f"✗ Audit FAILED at index {error_index}")
             return AuditReport(
                 status="failed",
-                total_entries=len(entries),
+                total_entries=self._count_audited(limit),
                 verified_entries=error_index,
                 error_index=error_index,
                 error_details={
                     "timestamp": corrupted_log.timestamp,
                     "category": corrupted_log.category,
                     "level": corrupted_log.level,
-                    "expected_prev": entries[error_index - 1].hash if error_index > 0 else "GENESIS",
+                    "expected_prev": expected_prev,
                     "actual_prev": corrupted_log.prev_hash,
                 }
             )
 
-    def _verify_with_merkle_tree(
-        self,
-        entries: List[LogEntry],
-        starting_hash: str
-    ) -> tuple[bool, Optional[int]]:
+    def _load_checkpoint(self) -> Union[tuple, AuditReport, None]:
         """
-        Vérification optimisée avec Merkle tree.
-        Plus rapide pour millions d'entries.
+        Dernier checkpoint (last_id, last_hash, entries) dont l'entrée scellée n'a pas
+        changé, sinon None (audit complet). Avec encryption_key, un sceau qui ne
+        correspond plus est une preuve d'altération: AuditReport "failed" à la place.
         """
-        try:
-            # Crée Merkle tree
-            merkle_tree = create_merkle_tree_from_entries(entries)
-            
-            # Garde root hash pour audit futur
-            self._last_root_hash = merkle_tree.root
-            
-            # Vérifie quand même la chaîne linéaire (pas d'alternative)
-            return verify_log_chain(entries, initial_prev_hash=starting_hash)
-        except Exception as e:
-            logger.error(f"Merkle verification failed: {e}")
-            return False, 0
+        checkpoint = self.db.get_chain_checkpoint()
+        if checkpoint is None:
+            return None
+        last_id, last_hash, tip, entries = checkpoint
+        stored_hash = self.db.get_log_hash(last_id)
+        key = self.config.encryption_key
+        if stored_hash is None:
+            reason = "sealed entry missing"
+        elif stored_hash != last_hash:
+            reason = "sealed entry hash changed"
+        elif not verify_chain_tip(last_id, stored_hash, entries, tip, key):
+            reason = "checkpoint tip does not verify"
+        else:
+            return last_id, last_hash, entries
+
+        if not key:
+            # Sceau non authentifié: rien ne distingue une altération d'un checkpoint périmé
+            logger.warning(f"Checkpoint at id {last_id} no longer matches ({reason}), running full audit")
+            return None
+
+        logger.error(f"✗ Audit FAILED: checkpoint at id {last_id} no longer matches ({reason})")
+        return AuditReport(
+            status="failed",
+            total_entries=self._count_audited(None),
+            verified_entries=0,
+            error_index=entries - 1,
+            error_details={
+                "checkpoint_last_id": last_id,
+                "checkpoint_hash": last_hash,
+                "stored_hash": stored_hash,
+                "reason": reason,
+            }
+        )
+
+    def _save_checkpoint(self, last_hash: str, entries: int) -> None:
+        """Scelle la pointe de chaîne qui vient d'être vérifiée."""
+        last_id = self.db.get_log_id(last_hash)
+        if last_id is not None:
+            self.db.save_chain_checkpoint(
+                last_id, last_hash,
+                compute_chain_tip(last_id, last_hash, entries, self.config.encryption_key),
+                entries
+            )
+
+    def _count_audited(self, limit: Optional[int]) -> int:
+        """Nombre d'entrées couvertes par un audit (sans les charger)."""
+        total = self.db.get_logs_count()
+        return min(total, limit) if limit else total
 
     def get_chain_summary(self) -> Dict[str, Any]:
         """Résumé rapide sans audit complet."""
@@ -7,6 +7,7 @@ Moteur asynchrone haute performance avec circuit breaker, métriques, et backpre
 from __future__ import annotations
 
 import queue
+import sys
 import threading
 import time
 import logging
@@ -17,14 +18,44 @@ from typing import Any, List, Optional
 from dataclasses import dataclass
 from enum import Enum
 
-from .models import LogEntry, ViraxConfig, MetricsSnapshot
+from .models import (
+    LogEntry, LogRow, HeartbeatEntry, ViraxConfig, MetricsSnapshot, SCHEMA_VERSION
+)
 from .database import DatabaseManager
 from .watchers import WatcherManager
-from .utils.crypto import compute_entry_hash
-from .utils.helpers import get_caller_context, format_source_string, sanitize_data
+from .utils.crypto import compute_entry_hash, get_hash_backend
+from .utils.helpers import (
+    get_caller_context, format_source_string, sanitize_data, fast_iso_utc
+)
 
 logger = logging.getLogger("ViraxLog.Core")
 
+# Sévérité numérique pour le filtrage précoce (cf. logging.isEnabledFor)
+_LEVEL_NUM = {
+    "TRACE": 5, "DEBUG": 10, "INFO": 20, "WARNING": 30,
+    "ERROR": 40, "CRITICAL": 50, "FATAL": 60,
+}
+
+# Forme canonique (même objet str) pour les casses usuelles de chaque niveau
+_LEVEL_CANON = {name: name for name in _LEVEL_NUM}
+_LEVEL_CANON.update({name.lower(): name for name in _LEVEL_NUM})
+
+FLUSH_INTERVAL_SEC = 2.0   # Flush max entre deux commits
+MAX_DRAIN_SEC = 0.05       # Durée max d'une rafale de drain
+MAX_WRITE_RETRIES = 3      # Échecs d'écriture tolérés à l'arrêt avant d'abandonner la fin de chaîne
+MAX_BACKOFF_SEC = 5.0      # Attente max entre deux tentatives d'écriture
+
+
+def _intern_str(value: str) -> str:
+    """
+    sys.intern() n'accepte que des str exacts: les sous-classes (Enum str,
+    identifiants typés) sont ramenées à leur valeur str, les autres types
+    (int, ...) convertis par str().
+    """
+    if type(value) is not str:
+        value = str.__str__(value) if isinstance(value, str) else str(value)
+    return sys.intern(value)
+
 
 class CircuitState(Enum):
     """États du circuit breaker."""
@@ -78,15 +109,27 @@ class ViraxLogger:
     """Moteur de logging central avec haute performance."""
 
     def __init__(self, config: ViraxConfig, session_id: str = "MAIN") -> None:
+        config.validate()  # ValueError documenté avant tout usage de la config
         self.config = config
-        self.session_id = session_id
+        self.session_id = _intern_str(session_id)
+        self._min_level_num = _LEVEL_NUM[config.log_level.upper()]
+        self._capture_source = config.capture_source
+        self._source_levels = config.source_levels
         
         # Components
         self.db = DatabaseManager(config)
-        self.watchers = WatcherManager(max_workers=config.max_watcher_threads)
+        self._hash_algo = self.db.hash_algorithm  # Fixé par le registre (table meta)
+        self.watchers = WatcherManager(
+            max_workers=config.max_watcher_threads,
+            max_pending=config.watcher_queue_maxsize
+        )
+        
+        # Queue thread-safe (SimpleQueue C) de tuples bruts + sémaphore pour la backpressure
+        self._queue: queue.SimpleQueue[LogRow] = queue.SimpleQueue()
+        self._slots = threading.BoundedSemaphore(config.queue_maxsize)
         
-        # Thread-safe queue
-        self._queue: queue.Queue[LogEntry] = queue.Queue(maxsize=config.queue_maxsize)
+        # Canal latéral des heartbeats, écrits par le worker (writer unique)
+        self._heartbeats: queue.SimpleQueue[HeartbeatEntry] = queue.SimpleQueue()
         
         # Chaîne cryptographique
         self._hash_lock = threading.RLock()
@@ -124,53 +167,69 @@ class ViraxLogger:
             )
             self._heartbeat_thread.start()
         
-        logger.info(f"ViraxLog v2.0 initialized | Session: {session_id}")
+        hash_backend = get_hash_backend(self._hash_algo)
+        logger.info(
+            f"ViraxLog v2.0 initialized | Session: {session_id} | "
+            f"Hash: {self._hash_algo} ({hash_backend})"
+        )
+        if self._hash_algo.startswith("sha") and hash_backend != "openssl":
+            logger.warning(f"{self._hash_algo} is not OpenSSL-backed: no SHA-NI acceleration")
 
     # ========== LOGGING API ==========
 
+    def is_enabled(self, level: str) -> bool:
+        """Vrai si le niveau passe le filtre log_level (garde pour data coûteuse)."""
+        level = _LEVEL_CANON.get(level) or level.upper()
+        return _LEVEL_NUM.get(level, 0) >= self._min_level_num
+
     def log(self, level: str, category: str, data: Any) -> None:
         """Enregistre une entrée (non-blocking sauf queue pleine)."""
         try:
-            # Contexte appelant
-            ctx = get_caller_context(depth=2)
-            source_str = format_source_string(ctx)
-            clean_data = sanitize_data(data)
+            level = _LEVEL_CANON.get(level) or sys.intern(level.upper())
+            # Filtre avant tout travail: un niveau filtré ne coûte rien
+            if _LEVEL_NUM.get(level, 0) < self._min_level_num:
+                return
+            if not category:
+                raise ValueError("category must be non-empty string")
+            category = _intern_str(category)
             
-            with self._hash_lock:
-                timestamp = datetime.now(timezone.utc).isoformat(timespec='seconds')
-                prev_hash = self._last_hash
-                data_str = LogEntry.serialize_data(clean_data)
-                
-                # Hash
-                entry_hash = compute_entry_hash(
-                    timestamp, level.upper(), category, data_str, prev_hash
-                )
-                
-                entry = LogEntry(
-                    timestamp=timestamp,
-                    session_id=self.session_id,
-                    level=level.upper(),
-                    category=category,
-                    source=source_str,
-                    data=data_str,
-                    hash=entry_hash,
-                    prev_hash=prev_hash
-                )
-                
-                self._last_hash = entry_hash
+            # Travail coûteux hors verrou: contexte, sanitization, sérialisation
+            if self._capture_source and level in self._source_levels:
+                source_str = format_source_string(get_caller_context(depth=2))
+            else:
+                source_str = ""
+            data_str, data_bytes = LogEntry.serialize_data_bytes(sanitize_data(data))
+            timestamp = fast_iso_utc()
             
-            # Enqueue avec gestion backpressure
-            try:
-                self._queue.put(entry, block=False)
-                with self._metrics_lock:
-                    self._metrics["logs_created"] += 1
-            except queue.Full:
-                with self._metrics_lock:
-                    self._metrics["logs_dropped"] += 1
+            # Backpressure: une place réservée par entrée, rendue après écriture
+            accepted = self._slots.acquire(blocking=False)
+            
+            if accepted:
+                # Section critique minimale: chaînage + enqueue dans l'ordre de la chaîne
+                with self._hash_lock:
+                    prev_hash = self._last_hash
+                    entry_hash = compute_entry_hash(
+                        timestamp, level, category, data_str, prev_hash, self._hash_algo,
+                        data_bytes=data_bytes
+                    )
+                    # Tuple nu dans l'ordre de SQL_INSERT: executemany le consomme tel quel
+                    row = (
+                        timestamp, self.session_id, level, category, source_str,
+                        data_str, entry_hash, prev_hash, SCHEMA_VERSION
+                    )
+                    self._queue.put(row)
+                    self._last_hash = entry_hash
+            
+            with self._metrics_lock:
+                self._metrics["logs_created" if accepted else "logs_dropped"] += 1
+            
+            if not accepted:
                 logger.warning(f"Queue full! Log dropped: {category}")
+                return
             
-            # Watchers asynchrone
-            self.watchers.trigger(entry)
+            # Watchers asynchrone (LogEntry construit seulement si quelqu'un écoute)
+            if self.watchers.has_watchers():
+                self.watchers.trigger(LogEntry._make(row))
             
         except Exception as e:
             with self._metrics_lock:
@@ -180,42 +239,114 @@ class ViraxLogger:
     # ========== BACKGROUND PROCESSING ==========
 
     def _process_queue(self) -> None:
-        """Consomme queue et écrit batches DB."""
-        batch: List[LogEntry] = []
+        """Consomme queue par rafales et écrit batches DB (seul thread writer)."""
+        try:
+            self._drain_loop()
+        finally:
+            self.db.release_writer()
+
+    def _drain_loop(self) -> None:
+        """Boucle de drain: rafales de get_nowait() puis commit par batch."""
+        batch: List[LogRow] = []
+        beats: List[HeartbeatEntry] = []
+        batch_size = self.config.batch_size
+        get_nowait = self._queue.get_nowait
         last_commit_time = time.time()
+        failures = 0
+        stop_failures = 0
 
-        while not self._stop_event.is_set() or not self._queue.empty():
-            try:
-                entry = self._queue.get(timeout=0.5)
-                batch.append(entry)
-                
-                now = time.time()
-                is_batch_full = len(batch) >= self.config.batch_size
-                is_timeout = (now - last_commit_time > 2.0) and batch
-                
-                if is_batch_full or is_timeout:
-                    if self._write_batch(batch):
-                        batch.clear()
-                        last_commit_time = now
-                    else:
-                        # Retry logic
-                        time.sleep(0.1)
+        while not self._stop_event.is_set() or not self._queue.empty() or batch or beats:
+            stopping = self._stop_event.is_set()
+            idle = False
             
+            try:
+                if len(batch) < batch_size:
+                    # Bloque pour la première entrée, puis draine sans attente
+                    batch.append(self._queue.get(block=not stopping, timeout=0.5))
+                    deadline = time.monotonic() + MAX_DRAIN_SEC
+                    try:
+                        while len(batch) < batch_size and time.monotonic() < deadline:
+                            batch.append(get_nowait())
+                    except queue.Empty:
+                        pass
             except queue.Empty:
-                if batch:
-                    self._write_batch(batch)
-                    batch.clear()
+                idle = True
             except Exception as e:
                 logger.error(f"Queue processing error: {e}")
+            
+            # Heartbeats en attente: écrits dans la même transaction que le batch
+            while not self._heartbeats.empty():
+                beats.append(self._heartbeats.get_nowait())
+            
+            if not batch and not beats:
+                continue
+            
+            now = time.time()
+            is_batch_full = len(batch) >= batch_size
+            is_timeout = now - last_commit_time > FLUSH_INTERVAL_SEC
+            
+            if is_batch_full or is_timeout or idle or stopping or beats:
+                written = self._write_batch(batch, beats)
+                if written:
+                    if batch:
+                        self._slots.release(len(batch))
+                    batch.clear()
+                    beats.clear()
+                    last_commit_time = now
+                    failures = 0
+                    continue
+                
+                # Le batch est gardé: _last_hash l'a déjà dépassé, l'abandonner laisserait
+                # en base une rupture de chaîne indiscernable d'une falsification
+                if stopping:
+                    # À l'arrêt: quelques tentatives rapprochées, puis abandon de la fin de chaîne
+                    stop_failures += 1
+                    if written is None or stop_failures >= MAX_WRITE_RETRIES:
+                        self._abandon_tail(batch)
+                        return
+                    time.sleep(0.1 * stop_failures)
+                    continue
+                if written is not None:
+                    failures += 1
+                # Backoff exponentiel (échecs transitoires: SQLITE_BUSY, I/O);
+                # circuit ouvert: attente simple, sans compter d'échec
+                time.sleep(min(0.1 * 2 ** failures, MAX_BACKOFF_SEC))
 
-    def _write_batch(self, batch: List[LogEntry]) -> bool:
-        """Écrit batch avec circuit breaker."""
+    def _abandon_tail(self, batch: List[LogRow]) -> None:
+        """
+        Arrêt avec écriture impossible: abandonne le batch et tout ce qui le suit.
+        Seule la fin de chaîne est perdue, la chaîne en base reste continue
+        (un prochain logger repart de son dernier hash).
+        """
+        lost = len(batch)
+        try:
+            while True:
+                self._queue.get_nowait()
+                lost += 1
+        except queue.Empty:
+            pass
+        if lost:
+            self._slots.release(lost)
+            logger.critical(f"Shutdown with unwritable database: {lost} entries lost from chain tail")
+            with self._metrics_lock:
+                self._metrics["logs_dropped"] += lost
+        batch.clear()
+
+    def _write_batch(
+        self,
+        batch: List[LogRow],
+        beats: Optional[List[HeartbeatEntry]] = None
+    ) -> Optional[bool]:
+        """
+        Écrit batch avec circuit breaker.
+        True: écrit; False: échec d'écriture; None: circuit ouvert, rien tenté.
+        """
         if not self._circuit_breaker.can_execute():
-            logger.warning("Circuit breaker OPEN - dropping batch")
-            return False
+            logger.warning("Circuit breaker OPEN - batch kept for retry")
+            return None
         
         try:
-            success = self.db.insert_log_batch(batch)
+            success = self.db.insert_log_batch(batch, beats or ())
             if success:
                 self._circuit_breaker.record_success()
                 with self._metrics_lock:
@@ -231,12 +362,12 @@ class ViraxLogger:
     # ========== HEARTBEAT ==========
 
     def _heartbeat_loop(self) -> None:
-        """Envoie heartbeats périodiques."""
+        """Envoie heartbeats périodiques (écrits par le worker)."""
         while not self._stop_event.is_set():
             try:
-                ts = datetime.now(timezone.utc).isoformat()
-                queue_size = self._queue.qsize()
-                self.db.insert_heartbeat(ts, "alive", queue_size)
+                self._heartbeats.put(
+                    HeartbeatEntry(fast_iso_utc(), "alive", self._queue.qsize())
+                )
                 
                 # Sleep avec early-exit
                 for _ in range(self.config.heartbeat_interval):
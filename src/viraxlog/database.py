@@ -6,18 +6,53 @@ Moteur haute-performance SQLite/PostgreSQL avec WAL, batch writes, et connection
 
 from __future__ import annotations
 
-import json
 import sqlite3
 import logging
 import threading
 import time
-from typing import List, Dict, Any, Optional, Union
-from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional, Tuple, Union, Iterator, Sequence
+from contextlib import contextmanager, nullcontext
 
-from .models import LogEntry, ViraxConfig
+from .models import LogRow, HeartbeatEntry, ViraxConfig
+from .utils.crypto import DEFAULT_HASH_ALGO, PREFERRED_HASH_ALGO, BLAKE3_AVAILABLE
+
+try:
+    import apsw
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    apsw = None
 
 logger = logging.getLogger("ViraxLog.Database")
 
+# Erreurs des deux drivers SQLite possibles pour la connexion writer
+_DB_ERRORS: tuple = (sqlite3.Error,) if apsw is None else (sqlite3.Error, apsw.Error)
+
+# Tuning SQLite pour un registre append-only
+SQLITE_PAGE_SIZE = 8192                  # Fichiers neufs uniquement
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024     # 256 MiB mappés
+SQLITE_WAL_AUTOCHECKPOINT = 10000        # Pages WAL avant checkpoint auto
+SQLITE_CACHED_STATEMENTS = 256           # Cache de statements préparés par connexion
+
+# Colonnes dans l'ordre de LogRow (et des champs de LogEntry): les tuples passent tels quels
+SQL_INSERT = """
+    INSERT INTO registry
+    (timestamp, session_id, level, category, source, data, hash, prev_hash, schema_version)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Idem pour HeartbeatEntry
+SQL_INSERT_HEARTBEAT = (
+    "INSERT INTO heartbeat (timestamp, status, queue_size) VALUES (?, ?, ?)"
+)
+
+# Epoch en ns dérivé du timestamp ISO (colonne générée, indexable)
+SQL_TS_NS_EXPR = "CAST(strftime('%s', timestamp) AS INTEGER) * 1000000000"
+
+# Colonnes nécessaires à l'audit (sans created_at)
+SQL_INTEGRITY_COLUMNS = (
+    "id, schema_version, timestamp, session_id, level, category, source, data, hash, prev_hash"
+)
+
 
 class DatabaseManager:
     """
@@ -28,8 +63,14 @@ class DatabaseManager:
     def __init__(self, config: ViraxConfig) -> None:
         self.config = config
         self.config.validate()
+        # Verrou des accès partagés (lectures, heartbeat, maintenance) sur self.conn.
+        # Les inserts du registre passent par une connexion writer dédiée, sans verrou.
         self._lock = threading.RLock()
-        self._write_lock = threading.Lock()
+        self._writer: Optional[sqlite3.Connection] = None
+        self._insert_cursor: Optional[Any] = None  # sqlite3.Cursor ou apsw.Cursor
+        self._shared_writer = False  # Base non-fichier: le writer réutilise self.conn
+        self._has_ts_ns = False
+        self.hash_algorithm: str = config.hash_algorithm or DEFAULT_HASH_ALGO
         
         if config.backend == "sqlite":
             self._init_sqlite()
@@ -43,14 +84,55 @@ class DatabaseManager:
 
     def _init_sqlite(self) -> None:
         """Initialisation SQLite optimisée."""
-        self.conn = sqlite3.connect(
+        self.conn = self._connect_sqlite(check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.backend = "sqlite"
+
+    def _connect_sqlite(self, check_same_thread: bool) -> sqlite3.Connection:
+        """Ouvre une connexion SQLite en autocommit (transactions explicites)."""
+        return sqlite3.connect(
             self.config.db_name,
-            check_same_thread=False,
+            check_same_thread=check_same_thread,
             isolation_level=None,
-            timeout=10.0
+            timeout=10.0,
+            cached_statements=SQLITE_CACHED_STATEMENTS
         )
-        self.conn.row_factory = sqlite3.Row
-        self.backend = "sqlite"
+
+    def _connect_apsw(self) -> Any:
+        """Connexion writer APSW (API C SQLite directe, executemany sans copie)."""
+        if apsw is None:
+            raise RuntimeError("APSW driver requires: pip install viraxlog[apsw]")
+        conn = apsw.Connection(self.config.db_name)
+        conn.setbusytimeout(10000)
+        return conn
+
+    def _get_insert_cursor(self) -> Any:
+        """
+        Curseur d'insertion réutilisé entre batches, sur la connexion d'écriture
+        ouverte dans le thread appelant (le worker ViraxLogger) et liée à lui
+        (check_same_thread=True). Driver: config.sqlite_driver.
+        Base en mémoire ou temporaire: une seconde connexion ouvrirait une autre
+        base vide, le writer réutilise donc self.conn (sous self._lock).
+        """
+        if self._insert_cursor is None:
+            if not self._is_file_target():
+                self._shared_writer = True
+                self._writer = self.conn
+                self._insert_cursor = self.conn.cursor()
+                return self._insert_cursor
+            if self.config.sqlite_driver == "apsw":
+                conn = self._connect_apsw()
+            else:
+                conn = self._connect_sqlite(check_same_thread=True)
+            self._apply_pragmas(conn)
+            self._writer = conn
+            self._insert_cursor = conn.cursor()
+        return self._insert_cursor
+
+    def _is_file_target(self) -> bool:
+        """Vrai si db_name désigne un fichier partageable entre connexions."""
+        name = self.config.db_name
+        return name not in ("", ":memory:") and "mode=memory" not in name
 
     def _init_postgres(self) -> None:
         """Initialisation PostgreSQL (v2.0+)."""
@@ -71,23 +153,34 @@ class DatabaseManager:
         """Setup schéma et pragmas."""
         try:
             if self.backend == "sqlite":
-                self._apply_pragmas()
+                self._apply_pragmas(self.conn)
             self._create_schema()
+            if self.backend == "sqlite":
+                self._migrate_schema()
+                self._resolve_hash_algorithm()
             self._create_indexes()
             logger.info(f"Database initialized ({self.backend})")
         except Exception as e:
             logger.critical(f"Database init failed: {e}")
             raise
 
-    def _apply_pragmas(self) -> None:
-        """Pragmas SQLite pour haute performance."""
-        pragmas = [
+    def _apply_pragmas(self, conn: Any) -> None:
+        """Pragmas SQLite pour haute performance (la plupart sont par connexion)."""
+        cursor = conn.cursor()  # API commune sqlite3 / apsw
+        pragmas = []
+        
+        # page_size n'a d'effet que sur un fichier vierge, avant le passage en WAL
+        if next(iter(cursor.execute("PRAGMA page_count;")))[0] == 0:
+            pragmas.append(f"PRAGMA page_size={SQLITE_PAGE_SIZE};")
+        
+        pragmas += [
             "PRAGMA journal_mode=WAL;",              # Write-Ahead Logging
             "PRAGMA synchronous=NORMAL;",             # Balance speed/safety
             "PRAGMA foreign_keys=ON;",
             f"PRAGMA cache_size=-{self.config.cache_size_mb * 1024};",
-            "PRAGMA temp_store=MEMORY;",
-            "PRAGMA mmap_size=30000000;",             # Memory-mapped I/O
+            "PRAGMA temp_store=MEMORY;",              # Pas de fichiers temporaires
+            f"PRAGMA mmap_size={SQLITE_MMAP_SIZE};",  # Lectures d'audit sans pread()
+            f"PRAGMA wal_autocheckpoint={SQLITE_WAL_AUTOCHECKPOINT};",
             "PRAGMA query_only=FALSE;",
             "PRAGMA busy_timeout=5000;",
             "PRAGMA max_page_count=4294967295;",
@@ -95,18 +188,21 @@ class DatabaseManager:
         
         for pragma in pragmas:
             try:
-                self.conn.execute(pragma)
-            except sqlite3.OperationalError as e:
+                # Itération: apsw n'exécute qu'au fil des rows retournées
+                for _ in cursor.execute(pragma):
+                    pass
+            except _DB_ERRORS as e:
                 logger.warning(f"Pragma failed: {pragma} - {e}")
+        cursor.close()
 
     def _create_schema(self) -> None:
         """Crée tables avec contraintes strictes."""
         if self.backend == "sqlite":
             with self.conn:
-                # Table principale
+                # Table principale (id = alias du rowid, sans sqlite_sequence)
                 self.conn.execute("""
                     CREATE TABLE IF NOT EXISTS registry (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        id INTEGER PRIMARY KEY,
                         schema_version INTEGER NOT NULL DEFAULT 2,
                         timestamp TEXT NOT NULL,
                         session_id TEXT NOT NULL,
@@ -123,6 +219,26 @@ class DatabaseManager:
                     )
                 """)
                 
+                # Métadonnées du registre (algorithme de hash de la chaîne)
+                self.conn.execute("""
+                    CREATE TABLE IF NOT EXISTS meta (
+                        key TEXT PRIMARY KEY,
+                        value TEXT NOT NULL
+                    )
+                """)
+                
+                # Points de reprise d'audit: pointe de chaîne déjà vérifiée
+                self.conn.execute("""
+                    CREATE TABLE IF NOT EXISTS chain_checkpoints (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        last_id INTEGER NOT NULL,
+                        last_hash TEXT NOT NULL,
+                        tip TEXT NOT NULL,
+                        entries INTEGER NOT NULL,
+                        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+                
                 # Table heartbeat
                 self.conn.execute("""
                     CREATE TABLE IF NOT EXISTS heartbeat (
@@ -145,6 +261,52 @@ class DatabaseManager:
                     )
                 """)
 
+    def _migrate_schema(self) -> None:
+        """Migrations additives, appliquées aussi aux registres existants."""
+        # table_xinfo (et non table_info) liste aussi les colonnes générées
+        columns = {r[1] for r in self.conn.execute("PRAGMA table_xinfo(registry)")}
+        
+        if "ts_ns" not in columns:
+            # Colonne VIRTUAL: rien à écrire à l'insert ni à backfiller, seul l'index stocke
+            try:
+                self.conn.execute(
+                    "ALTER TABLE registry ADD COLUMN ts_ns INTEGER "
+                    f"GENERATED ALWAYS AS ({SQL_TS_NS_EXPR}) VIRTUAL"
+                )
+                columns.add("ts_ns")
+            except sqlite3.OperationalError as e:
+                logger.warning(f"ts_ns column unavailable (SQLite >= 3.31 required): {e}")
+        
+        self._has_ts_ns = "ts_ns" in columns
+
+    def _resolve_hash_algorithm(self) -> None:
+        """Fixe l'algorithme de la chaîne: une fois choisi, il ne change plus."""
+        row = self.conn.execute(
+            "SELECT value FROM meta WHERE key = 'hash_algorithm'"
+        ).fetchone()
+        if row:
+            stored = row[0]
+        else:
+            # Registre antérieur à meta: ses hashes sont en BLAKE2b
+            has_logs = self.conn.execute("SELECT 1 FROM registry LIMIT 1").fetchone()
+            if has_logs:
+                stored = DEFAULT_HASH_ALGO
+            else:
+                stored = self.config.hash_algorithm or PREFERRED_HASH_ALGO
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO meta (key, value) VALUES ('hash_algorithm', ?)",
+                    (stored,)
+                )
+        
+        if self.config.hash_algorithm and self.config.hash_algorithm != stored:
+            raise ValueError(
+                f"hash_algorithm={self.config.hash_algorithm} but registry chain uses {stored}"
+            )
+        if stored == "blake3" and not BLAKE3_AVAILABLE:
+            raise RuntimeError("BLAKE3 support requires: pip install viraxlog[blake3]")
+        self.hash_algorithm = stored
+
     def _create_indexes(self) -> None:
         """Indexes optimisés pour requêtes communes."""
         indexes = [
@@ -153,10 +315,13 @@ class DatabaseManager:
             ("idx_level", "registry", "(level)"),
             ("idx_timestamp", "registry", "(timestamp DESC)"),
             ("idx_session", "registry", "(session_id, timestamp)"),
-            ("idx_hash", "registry", "(hash)"),
         ]
+        if self._has_ts_ns:
+            indexes.append(("idx_ts_ns", "registry", "(ts_ns)"))
         
         with self.conn:
+            # hash est UNIQUE (autoindex SQLite): idx_hash doublait chaque digest sur disque
+            self.conn.execute("DROP INDEX IF EXISTS idx_hash")
             for name, table, cols in indexes:
                 try:
                     self.conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table}{cols}")
@@ -165,48 +330,60 @@ class DatabaseManager:
 
     # ========== WRITE OPERATIONS ==========
 
-    def insert_log_batch(self, entries: List[LogEntry]) -> bool:
-        """Insère batch d'entrées atomiquement."""
-        if not entries:
-            return True
-
-        sql = """
-            INSERT INTO registry
-            (schema_version, timestamp, session_id, level, category, source, data, hash, prev_hash)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    def insert_log_batch(
+        self,
+        entries: Sequence[LogRow],
+        heartbeats: Sequence[HeartbeatEntry] = ()
+    ) -> bool:
         """
-
-        payload = []
-        for e in entries:
-            data_str = e.data if isinstance(e.data, str) else json.dumps(e.data)
-            payload.append((
-                e.schema_version, e.timestamp, e.session_id, e.level,
-                e.category, e.source, data_str, e.hash, e.prev_hash
-            ))
+        Insère batch d'entrées (et heartbeats en attente) atomiquement.
+        Doit toujours être appelé depuis le même thread (writer unique).
+        """
+        if not entries and not heartbeats:
+            return True
 
         start = time.time()
-        with self._write_lock:
-            try:
-                self.conn.execute("BEGIN IMMEDIATE")
-                self.conn.executemany(sql, payload)
-                self.conn.execute("COMMIT")
-                
-                # Stats
-                elapsed = (time.time() - start) * 1000
-                self._batch_stats["writes"] += 1
-                self._batch_stats["entries"] += len(entries)
-                self._batch_stats["last_write_ms"] = elapsed
-                
-                return True
-            except sqlite3.Error as e:
-                self.conn.execute("ROLLBACK")
-                logger.error(f"Batch insert failed: {e}")
-                return False
+        cursor = self._get_insert_cursor()
+        with self._lock if self._shared_writer else nullcontext():
+            return self._run_insert(cursor, entries, heartbeats, start)
+
+    def _run_insert(
+        self,
+        cursor: Any,
+        entries: Sequence[LogRow],
+        heartbeats: Sequence[HeartbeatEntry],
+        start: float
+    ) -> bool:
+        """Transaction d'insertion d'un batch sur le curseur writer."""
+        in_transaction = False
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            in_transaction = True
+            cursor.executemany(SQL_INSERT, entries)
+            if heartbeats:
+                cursor.executemany(SQL_INSERT_HEARTBEAT, heartbeats)
+            cursor.execute("COMMIT")
+            
+            # Stats
+            elapsed = (time.time() - start) * 1000
+            self._batch_stats["writes"] += 1
+            self._batch_stats["entries"] += len(entries)
+            self._batch_stats["last_write_ms"] = elapsed
+            
+            return True
+        except _DB_ERRORS as e:
+            if in_transaction:
+                try:
+                    cursor.execute("ROLLBACK")
+                except _DB_ERRORS:
+                    pass  # COMMIT déjà appliqué ou transaction annulée par SQLite
+            logger.error(f"Batch insert failed: {e}")
+            return False
 
     def insert_heartbeat(self, timestamp: str, status: str, queue_size: int = 0) -> None:
         """Enregistre heartbeat avec taille queue."""
         try:
-            with self.conn:
+            with self._lock, self.conn:
                 self.conn.execute(
                     "INSERT INTO heartbeat (timestamp, status, queue_size) VALUES (?, ?, ?)",
                     (timestamp, status, queue_size)
@@ -219,9 +396,10 @@ class DatabaseManager:
     def get_last_hash(self) -> str:
         """Récupère le dernier hash pour chaînage."""
         try:
-            row = self.conn.execute(
-                "SELECT hash FROM registry ORDER BY id DESC LIMIT 1"
-            ).fetchone()
+            with self._lock:
+                row = self.conn.execute(
+                    "SELECT hash FROM registry ORDER BY id DESC LIMIT 1"
+                ).fetchone()
             return row["hash"] if row else "GENESIS"
         except sqlite3.Error as e:
             logger.error(f"get_last_hash failed: {e}")
@@ -233,7 +411,10 @@ class DatabaseManager:
         limit: int = 100,
         offset: int = 0
     ) -> List[Dict[str, Any]]:
-        """Requête flexible avec filtres."""
+        """
+        Requête flexible avec filtres.
+        since/until: str ISO-8601, datetime (naïf = UTC) ou epoch en secondes.
+        """
         filters = filters or {}
         
         sql = "SELECT * FROM registry WHERE 1=1"
@@ -244,13 +425,18 @@ class DatabaseManager:
                 sql += f" AND {key} = ?"
                 params.append(filters[key])
 
-        if filters.get("since"):
-            sql += " AND timestamp >= ?"
-            params.append(filters["since"])
-
-        if filters.get("until"):
-            sql += " AND timestamp <= ?"
-            params.append(filters["until"])
+        # Bornes temporelles: plage entière sur ts_ns (index 8 octets) si possible
+        for key, op in (("since", ">="), ("until", "<=")):
+            bound = filters.get(key)
+            if not bound:
+                continue
+            bound_ns = _to_epoch_ns(bound) if self._has_ts_ns else None
+            if bound_ns is not None:
+                sql += f" AND ts_ns {op} ?"
+                params.append(bound_ns)
+            else:
+                sql += f" AND timestamp {op} ?"
+                params.append(bound if isinstance(bound, str) else _to_iso(bound))
 
         if filters.get("session_id"):
             sql += " AND session_id = ?"
@@ -260,34 +446,100 @@ class DatabaseManager:
         params.extend([limit, offset])
 
         try:
-            return [dict(r) for r in self.conn.execute(sql, params).fetchall()]
+            with self._lock:
+                return [dict(r) for r in self.conn.execute(sql, params).fetchall()]
         except sqlite3.Error as e:
             logger.error(f"Query failed: {e}")
             return []
 
-    def get_integrity_rows(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
-        """Récupère rows pour audit (ordre ASC)."""
+    def get_integrity_rows(
+        self,
+        limit: Optional[int] = None,
+        after_id: Optional[int] = None
+    ) -> Iterator[sqlite3.Row]:
+        """
+        Itère les rows pour audit (ordre ASC) sans matérialiser la table.
+        Une erreur SQLite en cours de lecture est relevée à l'appelant.
+        """
+        if after_id is not None:
+            # Reprise après un checkpoint: seul le suffixe est relu
+            sql = f"SELECT {SQL_INTEGRITY_COLUMNS} FROM registry WHERE id > ? ORDER BY id ASC"
+            params: tuple = (after_id,)
+        elif limit:
+            sql = (
+                f"SELECT * FROM (SELECT {SQL_INTEGRITY_COLUMNS} FROM registry "
+                "ORDER BY id DESC LIMIT ?) ORDER BY id ASC"
+            )
+            params = (limit,)
+        else:
+            sql = f"SELECT {SQL_INTEGRITY_COLUMNS} FROM registry ORDER BY id ASC"
+            params = ()
+        
         try:
-            if limit:
-                rows = self.conn.execute(
-                    "SELECT * FROM registry ORDER BY id DESC LIMIT ?", (limit,)
-                ).fetchall()
-                return [dict(r) for r in reversed(rows)]
-            
-            rows = self.conn.execute(
-                "SELECT * FROM registry ORDER BY id ASC"
-            ).fetchall()
-            return [dict(r) for r in rows]
+            yield from self.conn.execute(sql, params)
         except sqlite3.Error as e:
+            # Propagée: un arrêt silencieux ferait auditer une chaîne tronquée
             logger.error(f"get_integrity_rows failed: {e}")
-            return []
+            raise
+
+    def get_log_hash(self, log_id: int) -> Optional[str]:
+        """Hash stocké de l'entrée log_id (None si absente)."""
+        try:
+            with self._lock:
+                row = self.conn.execute(
+                    "SELECT hash FROM registry WHERE id = ?", (log_id,)
+                ).fetchone()
+            return row[0] if row else None
+        except sqlite3.Error as e:
+            logger.error(f"get_log_hash failed: {e}")
+            return None
+
+    def get_log_id(self, entry_hash: str) -> Optional[int]:
+        """id de l'entrée portant entry_hash (index UNIQUE sur hash)."""
+        try:
+            with self._lock:
+                row = self.conn.execute(
+                    "SELECT id FROM registry WHERE hash = ?", (entry_hash,)
+                ).fetchone()
+            return row[0] if row else None
+        except sqlite3.Error as e:
+            logger.error(f"get_log_id failed: {e}")
+            return None
+
+    # ========== CHECKPOINTS ==========
+
+    def get_chain_checkpoint(self) -> Optional[Tuple[int, str, str, int]]:
+        """Dernier checkpoint d'audit: (last_id, last_hash, tip, entries)."""
+        try:
+            with self._lock:
+                row = self.conn.execute(
+                    "SELECT last_id, last_hash, tip, entries FROM chain_checkpoints "
+                    "ORDER BY id DESC LIMIT 1"
+                ).fetchone()
+            return tuple(row) if row else None
+        except sqlite3.Error as e:
+            logger.error(f"get_chain_checkpoint failed: {e}")
+            return None
+
+    def save_chain_checkpoint(self, last_id: int, last_hash: str, tip: str, entries: int) -> None:
+        """Enregistre la pointe de chaîne après un audit réussi."""
+        try:
+            with self._lock, self.conn:
+                self.conn.execute(
+                    "INSERT INTO chain_checkpoints (last_id, last_hash, tip, entries) "
+                    "VALUES (?, ?, ?, ?)",
+                    (last_id, last_hash, tip, entries)
+                )
+        except sqlite3.Error as e:
+            logger.error(f"save_chain_checkpoint failed: {e}")
 
     # ========== MAINTENANCE ==========
 
     def get_logs_count(self) -> int:
         """Compte total des logs."""
         try:
-            res = self.conn.execute("SELECT COUNT(*) FROM registry").fetchone()
+            with self._lock:
+                res = self.conn.execute("SELECT COUNT(*) FROM registry").fetchone()
             return res[0] if res else 0
         except sqlite3.Error:
             return 0
@@ -296,7 +548,7 @@ class DatabaseManager:
         """Supprime vieux heartbeats."""
         days = retention_days or self.config.retention_days
         try:
-            with self.conn:
+            with self._lock, self.conn:
                 cursor = self.conn.execute(
                     "DELETE FROM heartbeat WHERE timestamp < datetime('now', ?)",
                     (f"-{days} days",)
@@ -311,7 +563,8 @@ class DatabaseManager:
     def vacuum(self) -> None:
         """Compacte la base (coûteux)."""
         try:
-            self.conn.execute("VACUUM;")
+            with self._lock:
+                self.conn.execute("VACUUM;")
             logger.info("Database vacuumed")
         except sqlite3.Error as e:
             logger.error(f"Vacuum failed: {e}")
@@ -337,11 +590,52 @@ class DatabaseManager:
         except Exception:
             return 0.0
 
+    def release_writer(self) -> None:
+        """Ferme la connexion writer (à appeler depuis le thread writer)."""
+        if self._writer is not None:
+            try:
+                self._insert_cursor.close()
+                if not self._shared_writer:
+                    self._writer.close()
+            except _DB_ERRORS as e:
+                logger.error(f"Writer close error: {e}")
+            self._writer = None
+            self._insert_cursor = None
+
     def close(self) -> None:
         """Ferme connexion proprement."""
         try:
+            if self._writer is not None:
+                # Normalement déjà fermée par le worker via release_writer()
+                self.release_writer()
             if self.conn:
                 self.conn.close()
             logger.info("Database closed")
         except Exception as e:
             logger.error(f"Close error: {e}")
+
+
+# ========== TIME HELPERS ==========
+
+def _to_datetime(value: Union[str, datetime, int, float]) -> datetime:
+    """Normalise une borne temporelle en datetime UTC (ValueError si invalide)."""
+    if isinstance(value, datetime):
+        dt = value
+    elif isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, tz=timezone.utc)
+    else:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _to_epoch_ns(value: Union[str, datetime, int, float]) -> Optional[int]:
+    """Borne temporelle -> epoch ns (None si non interprétable)."""
+    try:
+        return int(_to_datetime(value).timestamp() * 1_000_000_000)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+def _to_iso(value: Union[datetime, int, float]) -> str:
+    """Borne temporelle -> ISO-8601 UTC, pour le filtre texte de repli."""
+    return _to_datetime(value).isoformat()
@@ -8,11 +8,20 @@ from __future__ import annotations
 
 import json
 from dataclasses import dataclass, asdict, field
-from typing import Any, Dict, Optional, Literal
+from typing import Any, Dict, FrozenSet, NamedTuple, Optional, Literal, Tuple
 from datetime import datetime, timezone
 from enum import Enum
 
-from .utils.crypto import compute_entry_hash
+from .utils.crypto import compute_entry_hash, HASH_ALGORITHMS, DEFAULT_HASH_ALGO
+from .utils.helpers import fast_iso_utc
+
+# Encodeur stdlib pré-construit (json.dumps avec options en instancie un par appel).
+# Seul encodeur des données stockées: orjson écrit autrement flottants (1e16),
+# datetimes, entiers > 64 bits et NaN, et le registre doit être identique
+# quelles que soient les extensions installées.
+_JSON_ENCODER = json.JSONEncoder(
+    default=str, separators=(',', ':'), sort_keys=True, ensure_ascii=False
+)
 
 SCHEMA_VERSION = 2
 MAX_DATA_SIZE = 1_000_000  # 1MB max per log
@@ -29,25 +38,31 @@ class LogLevel(str, Enum):
     FATAL = "FATAL"
 
 
-@dataclass(frozen=True, slots=True)
-class LogEntry:
+ALL_LEVELS: FrozenSet[str] = frozenset(lvl.value for lvl in LogLevel)
+
+# Ligne brute en attente d'écriture, dans l'ordre des colonnes de SQL_INSERT
+LogRow = Tuple[str, str, str, str, str, str, str, str, int]
+
+
+class LogEntry(NamedTuple):
     """
     Entrée de log immuable avec intégrité garantie.
-    Slots réduit la mémoire pour millions d'entrées.
+    NamedTuple: construction en C, pas de __dict__, et l'ordre des champs
+    est celui des colonnes de SQL_INSERT (tuple(entry) == row DB).
     """
     timestamp: str
     session_id: str
     level: str
     category: str
     source: str
-    data: str
+    data: str  # JSON canonique, toujours produit par serialize_data()
     hash: str
     prev_hash: str
-    schema_version: int = field(default=SCHEMA_VERSION)
+    schema_version: int = SCHEMA_VERSION
 
     def to_dict(self) -> Dict[str, Any]:
         """Conversion dict avec gestion stricte du type."""
-        return asdict(self)
+        return self._asdict()
 
     def to_json(self) -> str:
         """Export JSON optimisé."""
@@ -59,31 +74,36 @@ class LogEntry:
         Sérialisation déterministe avec vérification de taille.
         Utilise un ordre fixe pour garantir la stabilité du hash.
         """
+        return LogEntry.serialize_data_bytes(data, max_size)[0]
+
+    @staticmethod
+    def serialize_data_bytes(data: Any, max_size: int = MAX_DATA_SIZE) -> Tuple[str, bytes]:
+        """
+        Comme serialize_data(), mais retourne aussi la forme UTF-8.
+        Les octets sont de toute façon produits (contrôle de taille):
+        compute_entry_hash(data_bytes=...) les hache sans ré-encoder.
+        """
         try:
             if data is None:
-                return "{}"
+                return "{}", b"{}"
             
             # Validation taille préalable
-            temp_json = json.dumps(
-                data,
-                default=str,
-                separators=(',', ':'),
-                sort_keys=True,
-                ensure_ascii=False
-            )
+            temp_json = _JSON_ENCODER.encode(data)
+            raw = temp_json.encode('utf-8')
             
-            if len(temp_json.encode('utf-8')) > max_size:
+            if len(raw) > max_size:
                 raise ValueError(f"Data exceeds maximum size of {max_size} bytes")
             
-            return temp_json
+            return temp_json, raw
             
         except Exception as e:
             # Fallback sécurisé
-            return json.dumps({
+            fallback = json.dumps({
                 "error": "serialization_failed",
                 "details": str(e)[:200],
                 "type": type(data).__name__
             }, ensure_ascii=False)
+            return fallback, fallback.encode('utf-8')
 
     @classmethod
     def create(
@@ -95,7 +115,8 @@ class LogEntry:
         data: Any,
         prev_hash: str,
         timestamp: Optional[str] = None,
-        schema_version: int = SCHEMA_VERSION
+        schema_version: int = SCHEMA_VERSION,
+        algorithm: HASH_ALGORITHMS = DEFAULT_HASH_ALGO
     ) -> LogEntry:
         """Factory avec validation complète."""
         # Validation basique
@@ -107,14 +128,15 @@ class LogEntry:
             raise ValueError("category must be non-empty string")
         
         # Timestamp
-        ts = timestamp or datetime.now(timezone.utc).isoformat(timespec='seconds')
+        ts = timestamp or fast_iso_utc()
         
         # Sérialisation données
-        data_str = cls.serialize_data(data)
+        data_str, data_bytes = cls.serialize_data_bytes(data)
         
         # Hash cryptographique
         entry_hash = compute_entry_hash(
-            ts, level.upper(), category, data_str, prev_hash
+            ts, level.upper(), category, data_str, prev_hash, algorithm,
+            data_bytes=data_bytes
         )
         
         return cls(
@@ -130,6 +152,13 @@ class LogEntry:
         )
 
 
+class HeartbeatEntry(NamedTuple):
+    """Heartbeat transmis au worker pour écriture avec le batch de logs."""
+    timestamp: str
+    status: str
+    queue_size: int = 0
+
+
 @dataclass
 class ViraxConfig:
     """Configuration centralisée avec valeurs optimales par défaut."""
@@ -151,30 +180,50 @@ class ViraxConfig:
     auto_vacuum_interval: int = 3600
     
     # Cache & optimization
-    cache_size_mb: int = 256
+    cache_size_mb: int = 64  # Par connexion (lecture + writer)
     enable_compression: bool = False
     
+    # Contexte appelant (fichier:ligne [fonction]) - introspection de frame par log
+    capture_source: bool = True
+    source_levels: FrozenSet[str] = ALL_LEVELS  # ex: frozenset({"WARNING", "ERROR"})
+    
     # Sécurité
+    hash_algorithm: Optional[HASH_ALGORITHMS] = None  # None: celui du registre, sinon BLAKE3 si dispo
+    audit_workers: int = 1  # Threads de hashing pour l'audit (utile sur gros payloads)
     enable_hmac: bool = True
     encryption_key: Optional[str] = None
     
     # Watchers
     max_watcher_threads: int = 10
+    watcher_queue_maxsize: int = 10000  # Au-delà, les entries sont ignorées par les watchers
     
     # Backends alternatifs (v2.0+)
     backend: Literal["sqlite", "postgres"] = "sqlite"
     postgres_dsn: Optional[str] = None
+    sqlite_driver: Literal["sqlite3", "apsw"] = "sqlite3"  # Driver du writer SQLite
     
     def validate(self) -> None:
         """Validation de configuration stricte."""
+        if self.log_level.upper() not in ALL_LEVELS:
+            raise ValueError(f"log_level must be one of {sorted(ALL_LEVELS)}")
         if self.batch_size < 1:
             raise ValueError("batch_size must be >= 1")
         if self.queue_maxsize < self.batch_size:
             raise ValueError("queue_maxsize must be >= batch_size")
         if self.max_workers < 1:
             raise ValueError("max_workers must be >= 1")
+        if self.audit_workers < 1:
+            raise ValueError("audit_workers must be >= 1")
+        if self.watcher_queue_maxsize < 1:
+            raise ValueError("watcher_queue_maxsize must be >= 1")
         if self.heartbeat_interval < 10:
             raise ValueError("heartbeat_interval must be >= 10 seconds")
+        if not self.source_levels <= ALL_LEVELS:
+            raise ValueError(f"source_levels must be a subset of {sorted(ALL_LEVELS)}")
+        if self.hash_algorithm not in (None, "blake2b", "blake3", "sha256", "sha3_256"):
+            raise ValueError("hash_algorithm must be blake2b, blake3, sha256 or sha3_256")
+        if self.sqlite_driver not in ("sqlite3", "apsw"):
+            raise ValueError("sqlite_driver must be 'sqlite3' or 'apsw'")
         if self.backend == "postgres" and not self.postgres_dsn:
             raise ValueError("postgres_dsn required when backend='postgres'")
 
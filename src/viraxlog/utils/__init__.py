@@ -2,18 +2,25 @@
 
 from .crypto import (
     compute_entry_hash,
+    get_hash_backend,
     verify_log_chain,
+    verify_log_chain_detailed,
     validate_single_entry,
+    compute_chain_tip,
+    verify_chain_tip,
     hash_payload,
     compute_hmac,
     verify_hmac,
     MerkleTree,
+    MerkleAccumulator,
+    VerificationMemo,
     create_merkle_tree_from_entries,
 )
 
 from .helpers import (
     get_caller_context,
     format_source_string,
+    fast_iso_utc,
     sanitize_data,
     safe_json_dump,
     get_process_memory_mb,
@@ -34,17 +41,24 @@ from .helpers import (
 __all__ = [
     # Crypto
     "compute_entry_hash",
+    "get_hash_backend",
     "verify_log_chain",
+    "verify_log_chain_detailed",
     "validate_single_entry",
+    "compute_chain_tip",
+    "verify_chain_tip",
     "hash_payload",
     "compute_hmac",
     "verify_hmac",
     "MerkleTree",
+    "MerkleAccumulator",
+    "VerificationMemo",
     "create_merkle_tree_from_entries",
     
     # Helpers
     "get_caller_context",
     "format_source_string",
+    "fast_iso_utc",
     "sanitize_data",
     "safe_json_dump",
     "get_process_memory_mb",
@@ -10,14 +10,62 @@ import hashlib
 import hmac
 import logging
 import json
-from typing import Optional, List, Tuple, Literal, Any
-from functools import lru_cache
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from operator import attrgetter
+from typing import Optional, Dict, List, Tuple, Literal, Any, Iterable, Iterator
+from functools import lru_cache, partial
+
+try:
+    from blake3 import blake3 as _blake3
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    _blake3 = None
 
 logger = logging.getLogger("ViraxLog.Crypto")
 
 # Algorithmes supportés
-HASH_ALGORITHMS = Literal["blake2b", "sha256", "sha3_256"]
-DEFAULT_HASH_ALGO: HASH_ALGORITHMS = "blake2b"  # Plus rapide que SHA-256
+HASH_ALGORITHMS = Literal["blake2b", "blake3", "sha256", "sha3_256"]
+DEFAULT_HASH_ALGO: HASH_ALGORITHMS = "blake2b"  # Plus rapide que SHA-256; registres historiques
+BLAKE3_AVAILABLE = _blake3 is not None
+# Algorithme des nouveaux registres quand la config n'en impose pas
+PREFERRED_HASH_ALGO: HASH_ALGORITHMS = "blake3" if BLAKE3_AVAILABLE else "blake2b"
+
+# Encodeur canonique construit une fois: json.dumps(**options) en recrée un par appel.
+# Reste le json stdlib (et non orjson): les flottants/clés non-str s'y écrivent autrement,
+# et le hash doit être identique que l'extension soit installée ou non.
+_CANONICAL_JSON = json.JSONEncoder(sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+# Constructeurs hashlib par nom canonique: une recherche dict, sans lower() ni if/elif
+_CONSTRUCTORS: Dict[str, Any] = {
+    "blake2b": partial(hashlib.blake2b, digest_size=32),
+    "sha256": hashlib.sha256,
+    "sha3_256": hashlib.sha3_256,
+}
+
+# Hasher BLAKE3 réutilisé par thread (reset() bien moins cher qu'une instance)
+_tls = threading.local()
+
+
+def _require_blake3() -> None:
+    """Vérifie la présence du module blake3 (SIMD, extension Rust)."""
+    if _blake3 is None:
+        raise RuntimeError("BLAKE3 support requires: pip install viraxlog[blake3]")
+
+
+def get_hash_backend(algorithm: str) -> str:
+    """
+    Implémentation effective d'un algorithme.
+    'openssl' = EVP d'OpenSSL, qui utilise SHA-NI / extensions ARMv8 si le CPU les a;
+    'builtin' = implémentation interne de CPython.
+    """
+    algo = algorithm.lower()
+    if algo == "blake3":
+        return "blake3" if BLAKE3_AVAILABLE else "unavailable"
+    ctor = getattr(hashlib, algo, None)
+    if ctor is None:
+        return "unavailable"
+    return "openssl" if getattr(ctor, "__name__", "").startswith("openssl_") else "builtin"
 
 
 def compute_entry_hash(
@@ -26,97 +74,247 @@ def compute_entry_hash(
     category: str,
     data: Any,
     prev_hash: str,
-    algorithm: HASH_ALGORITHMS = DEFAULT_HASH_ALGO
+    algorithm: HASH_ALGORITHMS = DEFAULT_HASH_ALGO,
+    data_bytes: Optional[bytes] = None
 ) -> str:
     """
     Calcule hash cryptographique stable pour une entrée.
     - BLAKE2b: 2x plus rapide que SHA-256
+    - BLAKE3 (optionnel): SIMD AVX2/AVX-512/NEON, plus rapide encore
     - Ordre fixe pour stabilité
     - UTF-8 natif supporté
+    data_bytes: forme UTF-8 de data déjà calculée (serialize_data_bytes),
+    hachée telle quelle sans sérialisation ni encodage.
     """
-    # Normalisation données
-    if isinstance(data, (dict, list)):
-        data_str = json.dumps(
-            data,
-            sort_keys=True,
-            separators=(',', ':'),
-            ensure_ascii=False
-        )
-    else:
-        data_str = str(data)
-
-    # Construction payload avec ordre déterministe
-    payload_str = f"{timestamp}|{level}|{category}|{data_str}|{prev_hash}"
-    payload = payload_str.encode("utf-8")
+    # Normalisation données (cas courant: déjà sérialisées par le logger)
+    if data_bytes is None:
+        if type(data) is str:
+            data_str = data
+        elif isinstance(data, (dict, list)):
+            data_str = _CANONICAL_JSON.encode(data)
+        else:
+            data_str = str(data)
+        data_bytes = data_str.encode("utf-8")
 
+    # Mises à jour incrémentales: data (le gros champ) n'est jamais recopié
+    # dans un payload concaténé. Séparateur '|' conservé: hashes inchangés.
     try:
-        algo = algorithm.lower()
-        if algo == "blake2b":
-            return hashlib.blake2b(payload, digest_size=32).hexdigest()
-        elif algo == "sha256":
-            return hashlib.sha256(payload).hexdigest()
-        elif algo == "sha3_256":
-            return hashlib.sha3_256(payload).hexdigest()
-        else:
-            raise ValueError(f"Unsupported algorithm: {algorithm}")
+        h = _new_hasher(algorithm)
+        h.update(f"{timestamp}|{level}|{category}|".encode("utf-8"))
+        h.update(data_bytes)
+        h.update(f"|{prev_hash}".encode("utf-8"))
+        return h.hexdigest()
     except Exception as e:
         logger.critical(f"Hash computation failed: {e}")
         raise
 
 
+def _new_hasher(algo: str) -> Any:
+    """Instancie un hasher incrémental (API update/hexdigest)."""
+    ctor = _CONSTRUCTORS.get(algo)
+    if ctor is not None:
+        return ctor()
+    if algo == "blake3":
+        h = getattr(_tls, "blake3", None)
+        if h is None:
+            _require_blake3()
+            h = _tls.blake3 = _blake3()
+        else:
+            h.reset()
+        return h
+    # Noms non canoniques ("SHA256"...): normalisés seulement en cas d'échec
+    if algo != algo.lower():
+        return _new_hasher(algo.lower())
+    raise ValueError(f"Unsupported algorithm: {algo}")
+
+
 @lru_cache(maxsize=1024)
 def _cached_hash(payload_hash: str) -> str:
     """Cache interne pour optimisation."""
     return payload_hash
 
 
+class VerificationMemo:
+    """
+    Mémo borné des entrées déjà vérifiées (audits répétés en mémoire).
+    
+    Clé: (hash, prev_hash, empreinte du contenu, algorithme). L'empreinte est le
+    hash() Python (SipHash à clé aléatoire par process) des champs hachés: une
+    entrée altérée change de clé et repasse par le hash, sans que le mémo garde
+    une copie de data (mémoire bornée à ~maxsize x 200 octets).
+    Éviction FIFO au-delà de maxsize.
+    """
+
+    def __init__(self, maxsize: int = 100_000) -> None:
+        self.maxsize = maxsize
+        self._keys: Dict[tuple, None] = {}
+
+    @staticmethod
+    def key(entry: Any, algorithm: str) -> tuple:
+        content = hash((entry.timestamp, entry.level, entry.category, entry.data))
+        return entry.hash, entry.prev_hash, content, algorithm
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key: tuple) -> None:
+        if len(self._keys) >= self.maxsize:
+            del self._keys[next(iter(self._keys))]
+        self._keys[key] = None
+
+    def clear(self) -> None:
+        self._keys.clear()
+
+
+AUDIT_BLOCK_SIZE = 4096  # Entrées hashées par bloc en mode parallèle
+
+# Champs lus par la vérification, dans l'ordre des arguments de compute_entry_hash (+ hash)
+_ENTRY_FIELDS = attrgetter("timestamp", "level", "category", "data", "prev_hash", "hash")
+
+
+def _hash_entries(entries: List[Any], algorithm: str) -> List[str]:
+    return [
+        compute_entry_hash(e.timestamp, e.level, e.category, e.data, e.prev_hash, algorithm)
+        for e in entries
+    ]
+
+
+def _hash_in_parallel(
+    entries: Iterable[Any],
+    algorithm: str,
+    workers: int
+) -> Iterator[Tuple[Any, str]]:
+    """
+    Itère (entry, hash recalculé): chaque bloc est découpé en tranches contiguës
+    hashées sur un pool de threads (hashlib/blake3 relâchent le GIL sur les
+    gros payloads). La mémoire reste bornée à un bloc.
+    """
+    it = iter(entries)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ViraxAudit") as pool:
+        while True:
+            block = list(islice(it, AUDIT_BLOCK_SIZE))
+            if not block:
+                return
+            step = -(-len(block) // workers)
+            futures = [
+                pool.submit(_hash_entries, block[j:j + step], algorithm)
+                for j in range(0, len(block), step)
+            ]
+            hashes = [h for f in futures for h in f.result()]
+            yield from zip(block, hashes)
+
+
 def verify_log_chain(
-    entries: List[Any],
+    entries: Iterable[Any],
     initial_prev_hash: str = "GENESIS",
-    algorithm: HASH_ALGORITHMS = DEFAULT_HASH_ALGO
+    algorithm: HASH_ALGORITHMS = DEFAULT_HASH_ALGO,
+    memo: Optional[VerificationMemo] = None,
+    workers: int = 1
 ) -> Tuple[bool, Optional[int]]:
     """
     Vérification complète de la chaîne cryptographique.
     Retourne (valide, index_erreur).
+    Voir verify_log_chain_detailed() pour obtenir aussi l'entrée en défaut.
+    """
+    is_valid, error_index, _, _ = verify_log_chain_detailed(
+        entries, initial_prev_hash, algorithm, memo, workers
+    )
+    return is_valid, error_index
+
+
+def verify_log_chain_detailed(
+    entries: Iterable[Any],
+    initial_prev_hash: str = "GENESIS",
+    algorithm: HASH_ALGORITHMS = DEFAULT_HASH_ALGO,
+    memo: Optional[VerificationMemo] = None,
+    workers: int = 1
+) -> Tuple[bool, Optional[int], Any, Optional[str]]:
+    """
+    Vérification complète de la chaîne cryptographique.
+    Retourne (valide, index_erreur, entrée_en_défaut, prev_hash_attendu).
+    L'entrée est celle de l'index en défaut même quand workers > 1
+    lit le flux par blocs en avance.
+    
+    Accepte tout itérable (liste ou générateur en streaming).
     
     Optimisé pour:
     - Vérification rapide avec early-exit
     - Protection timing-attacks (hmac.compare_digest)
-    - Cache des hashes
+    - Mémo optionnel: une entrée déjà vérifiée à l'identique n'est pas re-hashée
+    - workers > 1: contenus hashés en parallèle par blocs, liens vérifiés en séquence
     """
     current_expected_prev_hash = initial_prev_hash
 
-    for i, entry in enumerate(entries):
-        # 1. Vérification du lien chaîne (prev_hash)
-        if not hmac.compare_digest(entry.prev_hash, current_expected_prev_hash):
-            logger.error(
-                f"[CHAIN_BREAK] Index {i}: prev_hash mismatch "
-                f"(expected={current_expected_prev_hash[:16]}..., "
-                f"found={entry.prev_hash[:16]}...)"
-            )
-            return False, i
-
-        # 2. Vérification du contenu (hash)
-        actual_hash = compute_entry_hash(
-            entry.timestamp,
-            entry.level,
-            entry.category,
-            entry.data,
-            entry.prev_hash,
-            algorithm
-        )
+    if workers > 1:
+        pairs: Iterable[Tuple[Any, Optional[str]]] = _hash_in_parallel(entries, algorithm, workers)
+    else:
+        pairs = ((entry, None) for entry in entries)
+
+    # Noms locaux: pas de LOAD_GLOBAL / LOAD_ATTR répétés dans la boucle chaude
+    fields = _ENTRY_FIELDS
+    compute = compute_entry_hash
+    compare = hmac.compare_digest
+
+    for i, (entry, actual_hash) in enumerate(pairs):
+        # Un seul appel C pour tous les champs (NamedTuple, dataclass ou objet quelconque)
+        ts, lv, cat, dat, ph, h = fields(entry)
+
+        # Entrée déjà vérifiée à l'identique: seul le lien chaîne reste à contrôler
+        if memo is not None:
+            key = memo.key(entry, algorithm)
+            if key in memo:
+                if not compare(ph, current_expected_prev_hash):
+                    _log_chain_break(i, current_expected_prev_hash, ph)
+                    return False, i, entry, current_expected_prev_hash
+                current_expected_prev_hash = h
+                continue
+
+        if actual_hash is None:
+            actual_hash = compute(ts, lv, cat, dat, ph, algorithm)
         
-        if not hmac.compare_digest(entry.hash, actual_hash):
-            logger.error(
-                f"[DATA_CORRUPTION] Index {i}: hash mismatch "
-                f"(computed={actual_hash[:16]}..., stored={entry.hash[:16]}...)"
-            )
-            return False, i
+        # Lien (prev_hash) et contenu (hash) en une seule comparaison à temps constant
+        # (cf. _digests_match, inliné ici)
+        if len(h) != len(actual_hash) or not compare(
+            h + ph, actual_hash + current_expected_prev_hash
+        ):
+            # Chemin d'échec uniquement: identifie le contrôle en défaut
+            if not compare(ph, current_expected_prev_hash):
+                _log_chain_break(i, current_expected_prev_hash, ph)
+            else:
+                logger.error(
+                    f"[DATA_CORRUPTION] Index {i}: hash mismatch "
+                    f"(computed={actual_hash[:16]}..., stored={h[:16]}...)"
+                )
+            return False, i, entry, current_expected_prev_hash
+
+        if memo is not None:
+            memo.add(key)
 
         # Mise à jour pour next block
-        current_expected_prev_hash = entry.hash
+        current_expected_prev_hash = h
+
+    return True, None, None, None
+
+
+def _digests_match(stored_hash: str, stored_prev: str, computed_hash: str, expected_prev: str) -> bool:
+    """
+    Compare (hash, prev_hash) en un seul hmac.compare_digest sur les concaténations.
+    Toujours à temps constant vis-à-vis du contenu; la longueur du digest calculé
+    est publique, et l'imposer au hash stocké rend la concaténation non ambiguë.
+    """
+    return len(stored_hash) == len(computed_hash) and hmac.compare_digest(
+        stored_hash + stored_prev, computed_hash + expected_prev
+    )
+
 
-    return True, None
+def _log_chain_break(index: int, expected: str, found: str) -> None:
+    logger.error(
+        f"[CHAIN_BREAK] Index {index}: prev_hash mismatch "
+        f"(expected={expected[:16]}..., found={found[:16]}...)"
+    )
 
 
 def validate_single_entry(
@@ -124,7 +322,7 @@ def validate_single_entry(
     prev_hash: str,
     algorithm: HASH_ALGORITHMS = DEFAULT_HASH_ALGO
 ) -> bool:
-    """Valide une seule entrée contre prev_hash."""
+    """Valide une seule entrée contre prev_hash (contenu et lien, une comparaison)."""
     try:
         computed = compute_entry_hash(
             entry.timestamp,
@@ -135,15 +333,42 @@ def validate_single_entry(
             algorithm
         )
         
-        is_content_ok = hmac.compare_digest(entry.hash, computed)
-        is_link_ok = hmac.compare_digest(entry.prev_hash, prev_hash)
-        
-        return is_content_ok and is_link_ok
+        return _digests_match(entry.hash, entry.prev_hash, computed, prev_hash)
     except Exception as e:
         logger.error(f"Single entry validation error: {e}")
         return False
 
 
+def compute_chain_tip(
+    last_id: int,
+    last_hash: str,
+    entries: int,
+    key: Optional[str] = None
+) -> str:
+    """
+    Empreinte d'un checkpoint d'audit (dernière entrée vérifiée et nombre d'entrées).
+    Avec key: HMAC-SHA256, infalsifiable sans la clé. Sans key: simple SHA-256,
+    que quiconque peut modifier la base peut aussi recalculer.
+    """
+    message = f"{last_id}|{last_hash}|{entries}"
+    if key:
+        return compute_hmac(message, key)
+    return hashlib.sha256(message.encode("utf-8")).hexdigest()
+
+
+def verify_chain_tip(
+    last_id: int,
+    stored_hash: Optional[str],
+    entries: int,
+    tip: str,
+    key: Optional[str] = None
+) -> bool:
+    """Vrai si l'entrée last_id porte toujours le hash scellé par le checkpoint."""
+    if stored_hash is None:
+        return False
+    return hmac.compare_digest(compute_chain_tip(last_id, stored_hash, entries, key), tip)
+
+
 # ========== MERKLE TREE POUR AUDIT RAPIDE ==========
 
 class MerkleTree:
@@ -215,6 +440,51 @@ class MerkleTree:
         return hmac.compare_digest(current_hash, self.root or "")
 
 
+class MerkleAccumulator:
+    """
+    Calcul incrémental de la racine Merkle en mémoire O(log n).
+    Donne la même racine que MerkleTree sur la même suite de hashes,
+    sans conserver les feuilles (audit en streaming).
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self._pending: List[Optional[str]] = []
+
+    def _push(self, level: int, node: str) -> None:
+        while True:
+            if level == len(self._pending):
+                self._pending.append(None)
+            left = self._pending[level]
+            if left is None:
+                self._pending[level] = node
+                return
+            self._pending[level] = None
+            node = hashlib.blake2b((left + node).encode()).hexdigest()
+            level += 1
+
+    def add(self, leaf_hash: str) -> None:
+        """Ajoute une feuille."""
+        self.count += 1
+        self._push(0, leaf_hash)
+
+    def root(self) -> Optional[str]:
+        """Racine de l'arbre (None si vide). Consomme l'état."""
+        if not self.count:
+            return None
+        
+        # Taille de chaque niveau: le dernier nœud d'un niveau impair est dupliqué
+        size, level = self.count, 0
+        while size > 1:
+            if size % 2:
+                odd = self._pending[level]
+                self._pending[level] = None
+                self._push(level + 1, hashlib.blake2b((odd + odd).encode()).hexdigest())
+            size = (size + 1) // 2
+            level += 1
+        return self._pending[level]
+
+
 def create_merkle_tree_from_entries(entries: List[Any]) -> MerkleTree:
     """Crée un Merkle tree à partir d'entrées."""
     hashes = [entry.hash for entry in entries]
@@ -226,12 +496,12 @@ def create_merkle_tree_from_entries(entries: List[Any]) -> MerkleTree:
 def hash_payload(payload: str, algorithm: HASH_ALGORITHMS = DEFAULT_HASH_ALGO) -> str:
     """Hash simple d'une chaîne."""
     data = payload.encode("utf-8")
-    if algorithm == "blake2b":
-        return hashlib.blake2b(data, digest_size=32).hexdigest()
-    elif algorithm == "sha256":
-        return hashlib.sha256(data).hexdigest()
-    elif algorithm == "sha3_256":
-        return hashlib.sha3_256(data).hexdigest()
+    ctor = _CONSTRUCTORS.get(algorithm)
+    if ctor is not None:
+        return ctor(data).hexdigest()
+    elif algorithm == "blake3":
+        _require_blake3()
+        return _blake3(data).hexdigest()
     else:
         raise ValueError(f"Unknown algorithm: {algorithm}")
 
@@ -9,43 +9,83 @@ from __future__ import annotations
 import os
 import sys
 import threading
+import time
 import traceback
 import json
 from datetime import datetime, date
-from typing import Dict, Any, Optional, List
+from typing import Callable, Dict, Any, Optional, List, Tuple
 import psutil
 
 # ========== STACK INTROSPECTION ==========
 
+# Partie statique du contexte par site d'appel: (code, ligne, chemin complet) -> (source, fonction, module)
+_CALLSITE_CACHE: Dict[Tuple[Any, int, bool], Tuple[str, str, str]] = {}
+_CALLSITE_CACHE_MAX = 4096  # Borne (code généré dynamiquement): vidé au-delà
+
+# PID mis en cache, rafraîchi dans l'enfant après fork()
+_pid = os.getpid()
+
+
+def _refresh_pid() -> None:
+    global _pid
+    _pid = os.getpid()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_refresh_pid)
+
+# Nom du thread lu une fois par thread (un renommage ultérieur n'est pas vu)
+_thread_local = threading.local()
+
+
+def _current_thread_name() -> str:
+    try:
+        return _thread_local.name
+    except AttributeError:
+        name = _thread_local.name = threading.current_thread().name
+        return name
+
+
 def get_caller_context(depth: int = 2, include_full_path: bool = False) -> Dict[str, Any]:
     """
     Introspection stack rapide avec sys._getframe (plus rapide qu'inspect.stack()).
     Récupère contexte appelant: fichier, ligne, fonction, thread.
+    Fichier/fonction/module sont mis en cache par (code, ligne).
     """
     try:
         frame = sys._getframe(depth)
-        code = frame.f_code
-        
-        filename = code.co_filename
-        if not include_full_path:
-            filename = os.path.basename(filename)
+        key = (frame.f_code, frame.f_lineno, include_full_path)
+        static = _CALLSITE_CACHE.get(key)
+        if static is None:
+            code = frame.f_code
+            filename = code.co_filename
+            if not include_full_path:
+                filename = os.path.basename(filename)
+            static = (
+                f"{filename}:{frame.f_lineno}",
+                code.co_name or "unknown",
+                frame.f_globals.get("__name__", "unknown"),
+            )
+            if len(_CALLSITE_CACHE) >= _CALLSITE_CACHE_MAX:
+                _CALLSITE_CACHE.clear()
+            _CALLSITE_CACHE[key] = static
 
         return {
-            "source": f"{filename}:{frame.f_lineno}",
-            "function": code.co_name or "unknown",
-            "module": frame.f_globals.get("__name__", "unknown"),
-            "thread_name": threading.current_thread().name,
+            "source": static[0],
+            "function": static[1],
+            "module": static[2],
+            "thread_name": _current_thread_name(),
             "thread_id": threading.get_ident(),
-            "process_id": os.getpid()
+            "process_id": _pid
         }
     except (ValueError, AttributeError):
         return {
             "source": "unknown",
             "function": "unknown",
             "module": "unknown",
-            "thread_name": threading.current_thread().name,
+            "thread_name": _current_thread_name(),
             "thread_id": threading.get_ident(),
-            "process_id": os.getpid()
+            "process_id": _pid
         }
 
 
@@ -59,46 +99,131 @@ def format_source_string(context: Dict[str, Any], include_thread: bool = False)
     return base
 
 
-# ========== DATA SANITIZATION ==========
+# ========== TIMESTAMPS ==========
 
-def sanitize_data(data: Any, max_depth: int = 5, _current_depth: int = 0) -> Any:
+# (seconde epoch, ISO-8601 formaté) - remplacé atomiquement
+_ts_cache: Tuple[int, str] = (-1, "")
+
+
+def fast_iso_utc() -> str:
     """
-    Nettoie données avant sérialisation.
-    Gère: dicts, listes, datetime, bytes, objets custom.
-    Limite profondeur pour éviter stack overflow.
+    Timestamp UTC ISO-8601 à la seconde ('2024-01-01T12:00:00+00:00').
+    Identique à datetime.now(timezone.utc).isoformat(timespec='seconds'),
+    mais formaté une seule fois par seconde et partagé entre threads.
     """
-    if _current_depth > max_depth:
-        return "[Max Depth Exceeded]"
+    global _ts_cache
+    sec = int(time.time())
+    cached = _ts_cache
+    if cached[0] != sec:
+        cached = (sec, time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime(sec)))
+        _ts_cache = cached
+    return cached[1]
 
-    # Types primitifs (passthrough)
-    if isinstance(data, (str, int, float, bool, type(None))):
-        return data
 
-    # Types temporels
-    if isinstance(data, (datetime, date)):
-        return data.isoformat()
+# ========== DATA SANITIZATION ==========
 
-    # Données binaires (en hex)
-    if isinstance(data, (bytes, bytearray)):
-        return data.hex()
+_PRIMITIVE_TYPES = (str, int, float, bool, type(None))
 
-    # Dictionnaires
-    if isinstance(data, dict):
-        return {
-            str(k): sanitize_data(v, max_depth, _current_depth + 1)
-            for k, v in data.items()
-        }
+# Dispatch O(1) sur le type exact (les sous-classes passent par isinstance)
+_PASSTHROUGH = frozenset(_PRIMITIVE_TYPES)
+_LEAF_CONVERTERS: Dict[type, Callable[[Any], Any]] = {
+    datetime: datetime.isoformat,
+    date: date.isoformat,
+    bytes: bytes.hex,
+    bytearray: bytearray.hex,
+}
+# Conteneurs séquentiels exacts: évitent la cascade isinstance des feuilles
+_SEQUENCE_TYPES = frozenset((list, tuple, set))
 
-    # Collections
-    if isinstance(data, (list, tuple, set)):
-        return [sanitize_data(item, max_depth, _current_depth + 1) for item in data]
 
-    # Objets avec __dict__
-    if hasattr(data, "__dict__"):
-        return sanitize_data(vars(data), max_depth, _current_depth + 1)
+def sanitize_data(data: Any, max_depth: int = 5, _current_depth: int = 0) -> Any:
+    """
+    Nettoie données avant sérialisation.
+    Gère: dicts, listes, datetime, bytes, objets custom.
+    Parcours itératif (pile explicite): pas de frame Python par nœud
+    ni de RecursionError; max_depth limite la taille de la sortie.
+    """
+    passthrough, converters, sequences = _PASSTHROUGH, _LEAF_CONVERTERS, _SEQUENCE_TYPES
+    if type(data) in passthrough and _current_depth <= max_depth:
+        return data
 
-    # Fallback: string representation
-    return str(data)
+    # Chaque tâche remplit out[key] à partir de value, à la profondeur depth
+    root: List[Any] = [data]
+    stack: List[Tuple[Any, Any, Any, int]] = [(root, 0, data, _current_depth)]
+    pop, push = stack.pop, stack.append
+
+    while stack:
+        out, key, value, depth = pop()
+        if depth > max_depth:
+            out[key] = "[Max Depth Exceeded]"
+            continue
+
+        t = type(value)
+        if t in passthrough:
+            out[key] = value
+            continue
+        if t in converters:
+            out[key] = converters[t](value)
+            continue
+
+        # Sous-classes des types feuilles (conteneurs exacts: pas de isinstance inutile)
+        if t is not dict and t not in sequences:
+            if isinstance(value, _PRIMITIVE_TYPES):
+                out[key] = value
+                continue
+            if isinstance(value, (datetime, date)):
+                out[key] = value.isoformat()
+                continue
+            if isinstance(value, (bytes, bytearray)):
+                out[key] = value.hex()
+                continue
+
+        child = depth + 1
+        # Les feuilles enfants sont traitées sur place, sans passer par la pile
+        inline = child <= max_depth
+
+        # Dictionnaires
+        if t is dict or isinstance(value, dict):
+            node: Dict[str, Any] = {str(k): v for k, v in value.items()}
+            out[key] = node
+            if len(node) != len(value):
+                # Collision après str(k): traitement dans l'ordre, la dernière valeur gagne
+                stack.extend(reversed([(node, str(k), v, child) for k, v in value.items()]))
+                continue
+            # Clés distinctes: chaque enfant a sa case, l'ordre de traitement est libre
+            for sk, v in node.items():
+                tv = type(v)
+                if inline and tv in passthrough:
+                    continue
+                if inline and tv in converters:
+                    node[sk] = converters[tv](v)
+                else:
+                    push((node, sk, v, child))
+            continue
+
+        # Collections
+        if t in sequences or isinstance(value, (list, tuple, set)):
+            node_list: List[Any] = list(value)
+            out[key] = node_list
+            for i, item in enumerate(node_list):
+                tv = type(item)
+                if inline and tv in passthrough:
+                    continue
+                if inline and tv in converters:
+                    node_list[i] = converters[tv](item)
+                else:
+                    push((node_list, i, item, child))
+            continue
+
+        # Objets avec __dict__
+        if hasattr(value, "__dict__"):
+            push((out, key, vars(value), child))
+            continue
+
+        # Fallback: string representation
+        out[key] = str(value)
+
+    return root[0]
 
 
 def safe_json_dump(obj: Any, max_size: int = 1_000_000) -> str:
@@ -277,5 +402,3 @@ class ExponentialMovingAverage:
         """Retourne valeur actuelle."""
         return self.value
 
-
-import time  # Import manquant pour rate limiter
@@ -49,8 +49,19 @@ CATEGORY_COLORS = {
 
 # ========== FORMATTING ==========
 
+FETCH_BATCH_ROWS = 1024  # Rows lues par fetchmany(), écrites en un seul write()
+
+# Libellés colorés pré-formatés des niveaux connus
+_LEVEL_LABELS = {
+    lvl: f"{color}{lvl:<9}{Colors.ENDC}" for lvl, color in LEVEL_COLORS.items()
+}
+
+
 def format_level(level: str) -> str:
     """Applique couleur au niveau."""
+    label = _LEVEL_LABELS.get(level)
+    if label is not None:
+        return label
     lvl_upper = level.upper()
     color = LEVEL_COLORS.get(lvl_upper, Colors.ENDC)
     return f"{color}{lvl_upper:<9}{Colors.ENDC}"
@@ -69,14 +80,22 @@ def format_category(category: str) -> str:
     return f"{category:<15}"
 
 
+def _needs_compaction(data_str: str) -> bool:
+    """Vrai si data_str n'est peut-être pas du JSON compact (anciens registres, fallback)."""
+    return data_str[:1] in ("{", "[") and (
+        ", " in data_str or ": " in data_str or "\n" in data_str or "\\u" in data_str
+    )
+
+
 def format_data(data_str: str, max_len: int = 80) -> str:
     """Formate et tronque données."""
-    try:
-        # Parse JSON si possible
-        data_obj = json.loads(data_str)
-        data_str = json.dumps(data_obj, ensure_ascii=False, separators=(',', ':'))
-    except Exception:
-        pass
+    # Le logger écrit déjà du JSON compact: re-parser ne sert qu'aux autres cas
+    if _needs_compaction(data_str):
+        try:
+            data_obj = json.loads(data_str)
+            data_str = json.dumps(data_obj, ensure_ascii=False, separators=(',', ':'))
+        except Exception:
+            pass
     
     # Tronque si trop long
     if len(data_str) > max_len:
@@ -93,9 +112,14 @@ def build_query(
     since_hours: Optional[int] = None,
     search_text: Optional[str] = None,
     limit: int = 50,
-    offset: int = 0
+    offset: int = 0,
+    ascending: bool = False
 ) -> tuple:
-    """Construit requête SQL avec filtres."""
+    """
+    Construit requête SQL avec filtres.
+    Sélectionne toujours les `limit` logs les plus récents (après `offset`);
+    ascending=True les renvoie du plus ancien au plus récent.
+    """
     sql = "SELECT id, timestamp, level, category, source, data, session_id FROM registry WHERE 1=1"
     params = []
     
@@ -124,6 +148,10 @@ def build_query(
     sql += " ORDER BY id DESC LIMIT ? OFFSET ?"
     params.extend([limit, offset])
     
+    if ascending:
+        # Seul le sous-ensemble limité est retrié par SQLite: lecture en flux côté Python
+        sql = f"SELECT * FROM ({sql}) ORDER BY id ASC"
+    
     return sql, params
 
 
@@ -157,10 +185,13 @@ def view_logs(
             since_hours=since_hours,
             search_text=search,
             limit=limit,
-            offset=offset
+            offset=offset,
+            ascending=not json_output
         )
         
-        rows = conn.execute(sql, params).fetchall()
+        cursor = conn.execute(sql, params)
+        cursor.arraysize = FETCH_BATCH_ROWS
+        rows = cursor.fetchmany()
         
         if not rows:
             print(f"{Colors.DIM}No logs found matching criteria.{Colors.ENDC}")
@@ -169,8 +200,10 @@ def view_logs(
         
         # Output
         if json_output:
+            rows += cursor.fetchall()
             output = [dict(r) for r in rows]
             print(json.dumps(output, ensure_ascii=False, indent=2))
+            displayed = len(rows)
         else:
             # Terminal display
             print()
@@ -183,22 +216,27 @@ def view_logs(
             print(header)
             print("-" * 150)
             
-            for r in reversed(rows):
-                row_str = (
+            # Flux: un bloc fetchmany() -> un write(), jamais tout le résultat en mémoire
+            write = sys.stdout.write
+            displayed = 0
+            while rows:
+                write("".join([
                     f"{r['id']:<6} | "
                     f"{format_timestamp(r['timestamp'])} | "
                     f"{format_level(r['level'])} | "
                     f"{format_category(r['category'])} | "
-                    f"{format_data(r['data'])}"
-                )
-                print(row_str)
+                    f"{format_data(r['data'])}\n"
+                    for r in rows
+                ]))
+                displayed += len(rows)
+                rows = cursor.fetchmany()
         
         # Stats
         total_query = "SELECT COUNT(*) FROM registry"
         total = conn.execute(total_query).fetchone()[0]
         
         print()
-        print(f"{Colors.DIM}Displayed: {len(rows)} | Total in DB: {total}{Colors.ENDC}\n")
+        print(f"{Colors.DIM}Displayed: {displayed} | Total in DB: {total}{Colors.ENDC}\n")
         
         conn.close()
         
@@ -9,17 +9,45 @@ from __future__ import annotations
 import re
 import uuid
 import time
+import queue
 import logging
 import threading
-import concurrent.futures
+from collections import deque
 from dataclasses import dataclass, field
 from typing import Callable, Dict, Any, List, Pattern, Optional, Literal
 from enum import Enum
 
 from .models import LogEntry
 
+try:
+    import hyperscan
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    hyperscan = None
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    ahocorasick = None
+
 logger = logging.getLogger("ViraxLog.Watchers")
 
+if hyperscan is not None:
+    # Mode littéral uniquement: la syntaxe regex Hyperscan diverge de re
+    # (x{,2}, \Z, classes POSIX...). SINGLEMATCH: un seul rappel par motif.
+    _HS_FLAGS = hyperscan.HS_FLAG_SINGLEMATCH
+
+
+# Sentinelle d'arrêt des threads dispatcher
+_STOP = object()
+
+# Marque les threads dispatcher: un shutdown() appelé depuis un callback ne doit pas s'attendre lui-même
+_dispatch_thread = threading.local()
+
+
+def _hs_collect(index: int, start: int, end: int, flags: int, hits: List[int]) -> None:
+    """Rappel Hyperscan: collecte l'index du littéral matché."""
+    hits.append(index)
+
 
 class WatcherType(str, Enum):
     """Types de watchers."""
@@ -41,6 +69,7 @@ class Watcher:
     last_hit_time: Optional[float] = None
     errors: int = 0
     watcher_type: WatcherType = WatcherType.SIMPLE
+    literal: Optional[str] = None  # Motif littéral (use_regex=False)
 
     def matches(self, entry: LogEntry) -> bool:
         """Vérifie si watcher doit trigger."""
@@ -69,49 +98,198 @@ class ThresholdWatcher:
     enabled: bool = True
     hits_in_window: List[float] = field(default_factory=list)
     triggered: bool = False
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
 
     def check_and_update(self, entry: LogEntry) -> bool:
         """Retourne True si seuil atteint."""
         if not self.enabled or not self.pattern.search(entry.category):
             return False
 
-        now = time.time()
-        # Nettoie vieux hits
-        self.hits_in_window = [t for t in self.hits_in_window if now - t < self.window_seconds]
-        self.hits_in_window.append(now)
+        # Plusieurs threads dispatcher peuvent évaluer le même watcher
+        with self._lock:
+            now = time.time()
+            # Nettoie vieux hits
+            self.hits_in_window = [t for t in self.hits_in_window if now - t < self.window_seconds]
+            self.hits_in_window.append(now)
+
+            if len(self.hits_in_window) >= self.threshold:
+                if not self.triggered:
+                    self.triggered = True
+                    return True
+            else:
+                self.triggered = False
+
+            return False
+
+
+def _by_priority(watcher: Watcher) -> int:
+    return watcher.priority
+
+
+def _build_prefilter(watchers: List[Watcher]) -> Optional[Pattern[str]]:
+    """
+    Alternation de tous les patterns: matche ssi au moins un watcher matche.
+    None si la combinaison changerait la sémantique (groupes numérotés,
+    flags divergents) ou si elle n'apporte rien (moins de deux watchers).
+    """
+    if len(watchers) < 2:
+        return None
+    default_flags = re.compile("").flags
+    if any(w.pattern.groups or w.pattern.flags != default_flags for w in watchers):
+        return None
+    try:
+        return re.compile("|".join(f"(?:{w.pattern.pattern})" for w in watchers))
+    except re.error:
+        return None
+
+
+def _compile_literals(words: List[str]) -> Any:
+    """Base Hyperscan en mode littéral (id = rang du mot), None si indisponible."""
+    if hyperscan is None or not words:
+        return None
+    try:
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[w.encode("utf-8") for w in words],
+            ids=list(range(len(words))),
+            elements=len(words),
+            flags=[_HS_FLAGS] * len(words),
+            literal=True
+        )
+    except (hyperscan.error, UnicodeEncodeError, TypeError) as e:
+        logger.debug(f"Hyperscan literal compile failed: {e}")
+        return None
+    return db
 
-        if len(self.hits_in_window) >= self.threshold:
-            if not self.triggered:
-                self.triggered = True
-                return True
+
+def _build_matcher(ordered: List[Watcher]) -> tuple:
+    """
+    Matcher combiné: (watchers, base Hyperscan, automate, littéraux, index regex, pré-filtre).
+    Les watchers littéraux passent en une passe par Hyperscan (mode littéral)
+    ou un automate Aho-Corasick; les watchers regex restent sur re
+    (pré-filtre puis re.search) pour garder exactement la sémantique Python.
+    """
+    literals: Dict[str, List[int]] = {}
+    regex_idx: List[int] = []
+    for i, w in enumerate(ordered):
+        if w.literal:
+            literals.setdefault(w.literal, []).append(i)
         else:
-            self.triggered = False
+            regex_idx.append(i)
+    items = list(literals.items())
+
+    hs_db = _compile_literals([word for word, _ in items])
+    automaton = None
+    if hs_db is None and ahocorasick is not None and items:
+        automaton = ahocorasick.Automaton()
+        for word, idx in items:
+            automaton.add_word(word, idx)
+        automaton.make_automaton()
+
+    prefilter = _build_prefilter([ordered[i] for i in regex_idx])
+    return ordered, hs_db, automaton, items, regex_idx, prefilter
+
+
+def _dispatch_loop(pending: queue.SimpleQueue) -> None:
+    """Boucle d'un thread dispatcher: une entry par get(), jusqu'à la sentinelle."""
+    # Pas de drain par rafales: un thread qui prendrait N entries exécuterait
+    # N callbacks en série pendant que les autres restent inactifs
+    get = pending.get
+    _dispatch_thread.active = True
+    while True:
+        item = get()
+        if item is _STOP:
+            return
+        manager, entry = item
+        manager._run_dispatch(entry)
+
+
+class _DispatchPool:
+    """
+    Threads dispatcher partagés par tous les WatcherManager du process.
+    Compteur de références: le pool démarre au premier manager actif et
+    s'arrête quand le dernier appelle shutdown(). La file porte des paires
+    (manager, entry): chaque manager ne dispatche que ses propres entries.
+    """
 
-        return False
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pending: queue.SimpleQueue = queue.SimpleQueue()
+        self._threads: List[threading.Thread] = []
+        self._refs = 0
+
+    def acquire(self, workers: int) -> queue.SimpleQueue:
+        """Enregistre un manager; le pool grandit jusqu'au plus grand max_workers demandé."""
+        with self._lock:
+            self._refs += 1
+            for i in range(len(self._threads), workers):
+                t = threading.Thread(
+                    target=_dispatch_loop,
+                    args=(self._pending,),
+                    name=f"ViraxWatcher_{i}",
+                    daemon=True
+                )
+                t.start()
+                self._threads.append(t)
+            return self._pending
+
+    def release(self) -> None:
+        """Retire un manager; le dernier arrête les threads (file neuve pour le suivant)."""
+        with self._lock:
+            self._refs -= 1
+            if self._refs:
+                return
+            pending, threads = self._pending, self._threads
+            self._pending, self._threads = queue.SimpleQueue(), []
+        for _ in threads:
+            pending.put(_STOP)
+        current = threading.current_thread()
+        for t in threads:
+            if t is not current:
+                t.join()
+
+
+# Pool unique du process
+_POOL = _DispatchPool()
 
 
 class WatcherManager:
     """
     Orchestrateur de watchers avec:
-    - Exécution asynchrone thread pool
+    - Dispatch asynchrone: trigger() ne fait qu'un put_nowait, pool de threads partagé
     - Ordering par priorité
     - Isolation erreurs
     - Statistiques
     """
 
-    def __init__(self, max_workers: int = 5) -> None:
+    def __init__(self, max_workers: int = 5, max_pending: int = 10000) -> None:
         self.logger = logging.getLogger("ViraxLog.Watchers")
-        self._watchers: Dict[str, Watcher] = {}
+        self._watchers: Dict[str, Watcher] = {}  # Lookup par ID
+        # Watchers simples triés par priorité (tri stable, refait à chaque mutation).
+        # Remplacée en bloc, jamais modifiée sur place: les dispatchers itèrent un snapshot.
+        self._sorted: List[Watcher] = []
         self._threshold_watchers: Dict[str, ThresholdWatcher] = {}
-        self._executor = concurrent.futures.ThreadPoolExecutor(
-            max_workers=max_workers,
-            thread_name_prefix="ViraxWatcher"
-        )
+        
+        # File du pool partagé (None tant qu'aucun watcher n'est enregistré)
+        self._pending: Optional[queue.SimpleQueue] = None
+        self._max_pending = max_pending
+        self._max_workers = max_workers
+        # Entries de ce manager confiées au pool et pas encore dispatchées: un jeton
+        # par entry (append/pop de deque atomiques, sans verrou côté appelant)
+        self._inflight: deque = deque()
+        self._idle = threading.Condition()  # Pris seulement pendant shutdown()
         self._shutdown_lock = threading.Lock()
         self._is_shutdown = False
+        
+        # Matchers combinés (watchers simples), recompilés à la demande
+        self._matcher_lock = threading.Lock()
+        self._matcher_dirty = True
+        self._matcher: Optional[tuple] = None  # Cf. _build_matcher
+        self._hs_local = threading.local()     # Scratch Hyperscan par thread
         self._stats = {
             "total_triggers": 0,
             "total_errors": 0,
+            "total_dropped": 0,
         }
 
     # ========== REGISTRATION ==========
@@ -135,15 +313,20 @@ class WatcherManager:
         except re.error as e:
             raise ValueError(f"Invalid pattern: {e}")
 
+        self._start_workers()
         wid = uuid.uuid4().hex[:8]
-        self._watchers[wid] = Watcher(
+        watcher = Watcher(
             id=wid,
             pattern=compiled,
             callback=callback,
             enabled=enabled,
             priority=priority,
-            watcher_type=watcher_type
+            watcher_type=watcher_type,
+            literal=None if use_regex or pattern == "*" else pattern
         )
+        self._watchers[wid] = watcher
+        self._sorted = sorted(self._sorted + [watcher], key=_by_priority)
+        self._matcher_dirty = True
         self.logger.debug(f"Watcher {wid} registered | pattern={pattern} | priority={priority}")
         return wid
 
@@ -163,6 +346,7 @@ class WatcherManager:
         except re.error as e:
             raise ValueError(f"Invalid pattern: {e}")
 
+        self._start_workers()
         wid = uuid.uuid4().hex[:8]
         self._threshold_watchers[wid] = ThresholdWatcher(
             id=wid,
@@ -181,7 +365,9 @@ class WatcherManager:
         """Supprime watcher par ID."""
         removed = False
         if watcher_id in self._watchers:
-            del self._watchers[watcher_id]
+            watcher = self._watchers.pop(watcher_id)
+            self._sorted = [w for w in self._sorted if w is not watcher]
+            self._matcher_dirty = True
             removed = True
         if watcher_id in self._threshold_watchers:
             del self._threshold_watchers[watcher_id]
@@ -192,38 +378,129 @@ class WatcherManager:
         """Active/désactive watcher."""
         if watcher_id in self._watchers:
             self._watchers[watcher_id].enabled = state
+            self._matcher_dirty = True
         if watcher_id in self._threshold_watchers:
             self._threshold_watchers[watcher_id].enabled = state
 
     # ========== DISPATCH ==========
 
+    def has_watchers(self) -> bool:
+        """True si au moins un watcher est enregistré."""
+        return bool(self._watchers or self._threshold_watchers)
+
     def trigger(self, entry: LogEntry) -> None:
-        """Déclenche watchers actifs pour une entry."""
-        if self._is_shutdown:
+        """Confie l'entry aux threads dispatcher (jamais bloquant)."""
+        pending = self._pending
+        if pending is None or self._is_shutdown:
             return
 
+        # Consommateurs en retard: on jette plutôt que de ralentir l'appelant
+        inflight = self._inflight
+        if len(inflight) >= self._max_pending:
+            self._stats["total_dropped"] += 1
+            return
+        inflight.append(None)
+        pending.put_nowait((self, entry))
+
+    def _start_workers(self) -> None:
+        """Rejoint le pool de threads dispatcher partagé au premier watcher."""
+        with self._shutdown_lock:
+            if self._pending is not None or self._is_shutdown:
+                return
+            self._pending = _POOL.acquire(self._max_workers)
+
+    def _run_dispatch(self, entry: LogEntry) -> None:
+        """Dispatch d'une entry depuis un thread du pool."""
+        try:
+            self._dispatch(entry)
+        except Exception as e:
+            self.logger.error(f"Watcher dispatch failed: {e}")
+        finally:
+            inflight = self._inflight
+            inflight.pop()
+            # Jeton retiré avant de lire le drapeau: shutdown() ne peut pas manquer le réveil
+            if not inflight and self._is_shutdown:
+                with self._idle:
+                    self._idle.notify_all()
+
+    def _dispatch(self, entry: LogEntry) -> None:
+        """Évalue les watchers pour une entry et exécute les callbacks."""
         # Watchers simples (ordered by priority)
-        active_watchers = sorted(
-            (w for w in self._watchers.values() if w.matches(entry)),
-            key=lambda w: w.priority
-        )
-
-        for watcher in active_watchers:
+        for watcher in self._match(entry):
             watcher.record_hit()
-            try:
-                self._executor.submit(self._safe_callback, watcher.callback, entry, watcher)
-                self._stats["total_triggers"] += 1
-            except concurrent.futures.RuntimeError:
-                self.logger.warning("Executor unavailable")
+            self._stats["total_triggers"] += 1
+            self._safe_callback(watcher.callback, entry, watcher)
 
         # Threshold watchers
-        for tw in self._threshold_watchers.values():
+        for tw in list(self._threshold_watchers.values()):
             if tw.check_and_update(entry):
-                try:
-                    self._executor.submit(self._safe_callback, tw.callback, entry, tw)
-                    self._stats["total_triggers"] += 1
-                except concurrent.futures.RuntimeError:
-                    pass
+                self._stats["total_triggers"] += 1
+                self._safe_callback(tw.callback, entry, tw)
+
+    def _match(self, entry: LogEntry) -> List[Watcher]:
+        """Watchers simples matchant l'entry, triés par priorité."""
+        if self._matcher_dirty:
+            with self._matcher_lock:
+                if self._matcher_dirty:
+                    self._rebuild_matcher()
+
+        matcher = self._matcher
+        if matcher is None:
+            # Première compilation en cours dans un autre thread
+            return [w for w in self._sorted if w.matches(entry)]
+        ordered, hs_db, automaton, literals, regex_idx, prefilter = matcher
+        category = entry.category
+        matched = set()
+
+        # Littéraux: une passe Hyperscan ou Aho-Corasick, sinon un test `in` par motif
+        hits = self._scan_literals(hs_db, category) if hs_db is not None else None
+        if hits is not None:
+            for k in hits:
+                matched.update(literals[k][1])
+        elif automaton is not None:
+            for _, idx in automaton.iter(category):
+                matched.update(idx)
+        else:
+            for word, idx in literals:
+                if word in category:
+                    matched.update(idx)
+
+        # Regex: une seule recherche suffit quand aucun pattern ne matche (cas courant)
+        if regex_idx and (prefilter is None or prefilter.search(category) is not None):
+            for i in regex_idx:
+                if ordered[i].pattern.search(category):
+                    matched.add(i)
+
+        # Les index sont des rangs de priorité
+        return [ordered[i] for i in sorted(matched) if ordered[i].enabled]
+
+    def _scan_literals(self, db: Any, category: str) -> Optional[List[int]]:
+        """Rangs des littéraux présents dans category (None si la scan échoue)."""
+        hits: List[int] = []
+        try:
+            db.scan(
+                category.encode("utf-8"),
+                match_event_handler=_hs_collect,
+                context=hits,
+                scratch=self._get_scratch(db)
+            )
+        except (hyperscan.error, UnicodeEncodeError) as e:
+            self.logger.debug(f"Hyperscan scan failed, using fallback: {e}")
+            return None
+        return hits
+
+    def _rebuild_matcher(self) -> None:
+        """Recompile le matcher combiné des watchers simples actifs."""
+        self._matcher_dirty = False
+        self._matcher = _build_matcher([w for w in self._sorted if w.enabled])
+
+    def _get_scratch(self, db: Any) -> Any:
+        """Scratch Hyperscan du thread courant (une scan concurrente par scratch)."""
+        local = self._hs_local
+        if getattr(local, "db", None) is not db:
+            local.scratch = hyperscan.Scratch(db)
+            local.db = db
+        return local.scratch
 
     def _safe_callback(self, callback: Callable, *args) -> None:
         """Exécute callback avec gestion erreurs."""
@@ -277,13 +554,22 @@ class WatcherManager:
             "threshold_watchers": len(self._threshold_watchers),
             "total_triggers": self._stats["total_triggers"],
             "total_errors": self._stats["total_errors"],
+            "total_dropped": self._stats["total_dropped"],
         }
 
     # ========== SHUTDOWN ==========
 
     def shutdown(self) -> None:
-        """Arrête executor et attend callbacks."""
-        self._is_shutdown = True
+        """Quitte le pool dispatcher après les entries déjà en attente."""
+        with self._shutdown_lock:
+            self._is_shutdown = True
+            pending, self._pending = self._pending, None
         self.logger.debug("Shutting down WatcherManager...")
-        self._executor.shutdown(wait=True)
+        if pending is not None:
+            # Depuis un callback, attendre bloquerait ce thread sur son propre jeton
+            # (et sur les entries en file derrière lui): on rend la main sans attendre
+            if not getattr(_dispatch_thread, "active", False):
+                with self._idle:
+                    self._idle.wait_for(lambda: not self._inflight)
+            _POOL.release()
         self.logger.info(f"Watchers shutdown complete | Stats: {self.get_stats()}")